@@ -0,0 +1,311 @@
+# benchmark.py
+"""Play the solver against every answer (or a seeded sample) and report quality and speed.
+
+    python benchmark.py --sample 200 --seed 1 --out bench.json
+    python benchmark.py --sample 200 --seed 1 --baseline bench.json --threshold 0.1
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+import numpy as np
+from constraints import get_constraint_index
+from feedback import get_feedback, update_constraints
+from opening_book import get_opening_book
+from solver import (
+    filter_candidates, rank_suggestions, rank_suggestions_lookahead, rank_suggestions_partitioned,
+    rank_suggestions_sampled,
+)
+from wordlist import load_answer_list, load_wordle_list
+from version import __version__
+
+MAX_TURNS = 6
+PHASES = ("update_constraints", "filter_candidates", "rank_suggestions")
+
+
+def peak_memory_mb():
+    """Peak resident set size of this process in MB, or None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class SampledRanker:
+    """rank_suggestions_sampled as a benchmark ranker, keeping states to audit afterwards."""
+
+    def __init__(self, sample_size, seed=0):
+        self.sample_size = sample_size
+        self.seed = seed
+        self.rankings = 0
+        self.sampled_states = []
+
+    def __call__(self, candidates, greens, yellows, grays):
+        self.rankings += 1
+        result = rank_suggestions_sampled(candidates, greens, yellows, grays, self.sample_size, self.seed)
+        if result.top5 and result.total > 2 * self.sample_size:
+            state = (candidates, dict(greens), {l: set(p) for l, p in yellows.items()}, set(grays))
+            self.sampled_states.append((state, result.top5[0][0]))
+        return result.top5
+
+    def audit(self):
+        """Compare each sampled top-1 with exact ranking, outside the timed loop."""
+        mismatches = sum(rank_suggestions(*state)[0][0] != top1 for state, top1 in self.sampled_states)
+        return {
+            "sample_size": self.sample_size,
+            "rankings": self.rankings,
+            "sampled_rankings": len(self.sampled_states),
+            "top1_mismatches": mismatches,
+            "top1_mismatch_rate": mismatches / len(self.sampled_states) if self.sampled_states else 0.0,
+        }
+
+
+class LookaheadRanker:
+    """rank_suggestions_lookahead as a benchmark ranker, totalling the work pruning avoided."""
+
+    def __init__(self, top_k):
+        self.top_k = top_k
+        self.totals = {"rankings": 0, "expanded": 0, "pruned": 0, "partitions_scored": 0, "partitions_avoided": 0}
+
+    def __call__(self, candidates, greens, yellows, grays):
+        result = rank_suggestions_lookahead(candidates, greens, yellows, grays, self.top_k)
+        self.totals["rankings"] += 1
+        for field in ("expanded", "pruned", "partitions_scored", "partitions_avoided"):
+            self.totals[field] += getattr(result, field)
+        return result.top5
+
+    def report(self):
+        return dict(self.totals, top_k=self.top_k)
+
+
+class PartitionRanker:
+    """rank_suggestions_partitioned as a benchmark ranker, totalling how guesses collapsed."""
+
+    def __init__(self):
+        self.totals = {"rankings": 0, "guesses": 0, "classes": 0, "trivial": 0}
+
+    def __call__(self, candidates, greens, yellows, grays, guesses=None):
+        result = rank_suggestions_partitioned(candidates, greens, yellows, grays, guesses=guesses)
+        self.totals["rankings"] += 1
+        for field in ("guesses", "classes", "trivial"):
+            self.totals[field] += getattr(result, field)
+        return result.top5
+
+    def report(self):
+        return dict(self.totals)
+
+
+class PoolRanker:
+    """Wraps a ranker so candidates from an answer pool are scored by every hard-mode-valid word."""
+
+    def __init__(self, words, rank=rank_suggestions):
+        self.words = words
+        self.rank = rank
+
+    def __call__(self, candidates, greens, yellows, grays):
+        mask = get_constraint_index().mask(greens, yellows, grays)
+        guesses = [self.words[i] for i in np.flatnonzero(mask)]
+        return self.rank(candidates, greens, yellows, grays, guesses=guesses)
+
+    def __getattr__(self, name):
+        # report() and friends come from the wrapped ranker
+        return getattr(self.rank, name)
+
+
+def play_game(answer, words, first_guess, timings, max_turns=MAX_TURNS, rank=rank_suggestions, book=None):
+    """Solve for answer with words as the starting candidates; returns the guesses used, or None on failure."""
+    candidates = words
+    greens = {}
+    yellows = defaultdict(set)
+    grays = set()
+    guess = first_guess
+    for turn in range(1, max_turns + 1):
+        feedback = get_feedback(guess, answer)
+        if feedback == "GGGGG":
+            return turn
+        start = time.perf_counter()
+        update_constraints(guess, feedback, greens, yellows, grays)
+        timings["update_constraints"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        candidates = filter_candidates(candidates, guess, feedback, greens, yellows, grays)
+        timings["filter_candidates"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        suggestions = book.second(guess, feedback) if book and turn == 1 else None
+        if suggestions is None:
+            suggestions = rank(candidates, greens, yellows, grays)
+        timings["rank_suggestions"].append(time.perf_counter() - start)
+        if not suggestions:
+            return None
+        guess = suggestions[0][0]
+    return None
+
+
+def _percentiles(samples):
+    if not samples:
+        return {"count": 0}
+    ms = np.array(samples) * 1000
+    return {
+        "count": len(samples),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p90_ms": float(np.percentile(ms, 90)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "max_ms": float(ms.max()),
+    }
+
+
+def run_benchmark(answers, words, max_turns=MAX_TURNS, rank=rank_suggestions, use_book=True, pool=None):
+    """Play every answer; with pool (an answer list), candidates start from it instead of words.
+
+    rank should then score every word as a guess; the opening book assumes the full list
+    and is skipped.
+    """
+    timings = {phase: [] for phase in PHASES}
+    start = time.perf_counter()
+    candidates = words if pool is None else pool
+    # The first turn is the same for every game, so it is ranked (and timed) once
+    book = get_opening_book() if use_book and pool is None else None
+    first = book.first() if book else None
+    if not first:
+        first = rank(candidates, {}, {}, set())
+    first_turn_s = time.perf_counter() - start
+
+    results = Counter()
+    failures = []
+    for answer in answers:
+        guesses = play_game(answer, candidates, first[0][0], timings, max_turns, rank, book)
+        if guesses is None:
+            failures.append(answer)
+        results[guesses or "failed"] += 1
+    elapsed = time.perf_counter() - start
+
+    solved = [g for g in results.elements() if g != "failed"]
+    return {
+        "version": __version__,
+        "games": len(answers),
+        "solutions": len(candidates),
+        "guesses": len(words),
+        "first_guess": first[0][0],
+        "first_turn_s": first_turn_s,
+        "distribution": {str(k): v for k, v in sorted(results.items(), key=lambda kv: str(kv[0]))},
+        "mean_guesses": float(np.mean(solved)) if solved else None,
+        "failure_rate": len(failures) / len(answers) if answers else 0.0,
+        "failures": failures[:50],
+        "elapsed_s": elapsed,
+        "games_per_sec": len(answers) / elapsed if elapsed else 0.0,
+        "latency": {phase: _percentiles(samples) for phase, samples in timings.items()},
+        "peak_memory_mb": peak_memory_mb(),
+    }
+
+
+def compare(result, baseline, threshold):
+    """Return an error message if throughput regressed past threshold, else None."""
+    floor = baseline["games_per_sec"] * (1 - threshold)
+    if result["games_per_sec"] < floor:
+        return (f"Throughput regression: {result['games_per_sec']:.2f} games/sec < "
+                f"{floor:.2f} ({baseline['games_per_sec']:.2f} baseline - {threshold:.0%})")
+    return None
+
+
+def print_report(result):
+    print(f"Games: {result['games']}  First guess: {result['first_guess'].upper()}  "
+          f"Solutions: {result['solutions']} of {result['guesses']} guesses")
+    print(f"Mean guesses: {result['mean_guesses']}  Failure rate: {result['failure_rate']:.2%}")
+    print("Distribution: " + ", ".join(f"{k}: {v}" for k, v in result["distribution"].items()))
+    print(f"Throughput: {result['games_per_sec']:.2f} games/sec ({result['elapsed_s']:.1f}s)")
+    for phase, stats in result["latency"].items():
+        if stats["count"]:
+            print(f"  {phase:<20} p50 {stats['p50_ms']:.3f} ms | p90 {stats['p90_ms']:.3f} ms | "
+                  f"p99 {stats['p99_ms']:.3f} ms")
+    if "partitions" in result:
+        p = result["partitions"]
+        print(f"Partitions: {p['guesses']} guesses scored -> {p['classes']} classes "
+              f"({p['trivial']} single-bucket guesses skipped)")
+    if "lookahead" in result:
+        la = result["lookahead"]
+        print(f"Lookahead (top {la['top_k']}): expanded {la['expanded']} guesses, pruned {la['pruned']} | "
+              f"partitions scored {la['partitions_scored']}, avoided {la['partitions_avoided']}")
+    if "sampled" in result:
+        sampled = result["sampled"]
+        print(f"Sampled rankings: {sampled['sampled_rankings']}/{sampled['rankings']} | "
+              f"top-1 differs from exact: {sampled['top1_mismatch_rate']:.2%}")
+    if result["peak_memory_mb"] is not None:
+        print(f"Peak memory: {result['peak_memory_mb']:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Wordle solver against the word list")
+    parser.add_argument("--sample", type=int, default=None, help="Play a random sample of N answers")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for --sample (default 0)")
+    parser.add_argument("--max-turns", type=int, default=MAX_TURNS)
+    parser.add_argument("--no-book", action="store_true", help="Ignore the opening book")
+    parser.add_argument("--sampled", type=int, default=None, metavar="M",
+                        help="Rank with sampled entropy over M candidates and audit top-1 against exact")
+    parser.add_argument("--lookahead", type=int, default=None, metavar="K",
+                        help="Rank with two-step lookahead over the top K guesses")
+    parser.add_argument("--dedup", action="store_true",
+                        help="Rank with partition dedup and report how many guesses collapsed")
+    parser.add_argument("--answers", nargs="?", const="", default=None, metavar="FILE",
+                        help="Draw answers and candidates from FILE (default: the 3,000 most frequent words), "
+                             "scoring every word as a guess")
+    parser.add_argument("--out", type=str, help="Write results to this JSON file")
+    parser.add_argument("--baseline", type=str, help="Compare throughput against a saved result")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Allowed fractional throughput drop vs --baseline (default 0.1)")
+    args = parser.parse_args()
+    for flag, value in (("--sampled", args.sampled), ("--lookahead", args.lookahead)):
+        if value is not None and value < 1:
+            parser.error(f"{flag} needs a value of at least 1")
+
+    words = load_wordle_list()
+    pool = None
+    if args.answers is not None:
+        if args.sampled or args.lookahead:
+            parser.error("--answers works with the exact and --dedup rankings")
+        if args.answers and not os.path.isfile(args.answers):
+            parser.error(f"--answers file not found: {args.answers}")
+        pool = load_answer_list(args.answers or None)
+    answers = words if pool is None else pool
+    if args.sample:
+        answers = random.Random(args.seed).sample(answers, min(args.sample, len(answers)))
+
+    rank = rank_suggestions
+    if args.sampled:
+        rank = SampledRanker(args.sampled, args.seed)
+    elif args.lookahead:
+        rank = LookaheadRanker(args.lookahead)
+    elif args.dedup:
+        rank = PartitionRanker()
+    if pool is not None:
+        rank = PoolRanker(words, rank)
+    # The book holds one-step rankings, which would stand in for the sampled or lookahead ones
+    use_book = not (args.no_book or args.sampled or args.lookahead)
+    result = run_benchmark(answers, words, args.max_turns, rank, use_book=use_book, pool=pool)
+    if args.sampled:
+        result["sampled"] = rank.audit()
+    elif args.lookahead:
+        result["lookahead"] = rank.report()
+    elif args.dedup:
+        result["partitions"] = rank.report()
+    print_report(result)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(result, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            error = compare(result, json.load(f), args.threshold)
+        if error:
+            print(error)
+            sys.exit(1)
+        print("Throughput within threshold of baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,75 @@
 Build script for creating Windows executable of Wordle Solver
 """
 
+import argparse
 import os
+import statistics
 import subprocess
 import sys
+import time
 from pathlib import Path
 import shutil
 
-def build_executable():
+# Slim builds ship the precomputed tables instead of wordfreq and leave out numpy
+# subpackages the solver never uses, so the one-file bootloader unpacks less.
+# numpy.random stays: rank_suggestions_sampled draws its sample with it.
+SLIM_EXCLUDES = [
+    "wordfreq",
+    "numpy.f2py",
+    "numpy.distutils",
+    "numpy.testing",
+    "numpy.typing",
+]
+# numpy 1.x imports these from numpy/__init__ itself; 2.x loads them on first use
+NUMPY2_EXCLUDES = ["numpy.fft", "numpy.polynomial", "numpy.ma"]
+SLIM_DIST = Path("dist") / "slim"
+COLD_START_RUNS = 5
+ONE_SUGGESTION_ARGS = ["--guess", "crane", "--feedback", "BYGBY"]
+
+def prepare_artifacts():
+    """Bring the precomputed data files up to date and return the ones to bundle.
+
+    The pattern matrix (~220 MB) is not bundled: compressed it would add ~150 MB to
+    the binary and seconds of unpacking to every launch. Frozen builds build it once
+    on first use into a per-user directory (see wordlist.app_data_dir).
+    """
+    from wordlist import FREQUENCY_FILENAME, get_frequencies
+    from opening_book import BOOK_FILENAME, get_opening_book
+    from decision_tree import TREE_FILENAME, get_decision_tree
+
+    get_frequencies()
+    files = ["wordle_list.txt", FREQUENCY_FILENAME]
+    if get_opening_book() is not None:
+        files.append(BOOK_FILENAME)
+    else:
+        print("[warn] No opening book; run `python opening_book.py` to bundle first-turn suggestions.")
+    if get_decision_tree() is not None:
+        files.append(TREE_FILENAME)
+    return files
+
+def _bundle_args(separator, slim, excludes=()):
+    """PyInstaller data and import options for a full or slim build."""
+    if not slim:
+        return [
+            f"--add-data=wordle_list.txt{separator}.",
+            "--collect-data=wordfreq",
+            "--hidden-import=numpy",
+            "--hidden-import=wordfreq",
+        ]
+    # Absolute sources: PyInstaller resolves data paths relative to --specpath
+    args = [f"--add-data={Path(name).resolve()}{separator}." for name in prepare_artifacts()]
+    import numpy
+    if int(numpy.__version__.split(".")[0]) >= 2:
+        excludes = [*NUMPY2_EXCLUDES, *excludes]
+    args += [f"--exclude-module={module}" for module in [*SLIM_EXCLUDES, *excludes]]
+    # Separate output dirs so a slim build can be compared against a full one
+    args += [f"--distpath={SLIM_DIST}", "--workpath=build/slim", "--specpath=build/slim"]
+    return args
+
+def build_executable(slim=False):
     """Build the Windows executable using PyInstaller"""
     
-    print("Building Wordle Solver v1.0.0 executable...")
+    print(f"Building Wordle Solver v1.0.0 {'slim ' if slim else ''}executable...")
     
     # Change to the project directory
     project_dir = Path(__file__).parent
@@ -27,15 +86,12 @@ def build_executable():
         "--onefile",
         "--windowed",
         "--name=WordleSolver",
-        f"--add-data=wordle_list.txt{separator}.",
         "--paths=.",
-        "--collect-data=wordfreq",
-        "--hidden-import=numpy",
-        "--hidden-import=wordfreq",
+        *_bundle_args(separator, slim),
     ]
 
     # Icon handling (Windows requires .ico)
-    ico_path = Path("docs/solver_icon.ico")
+    ico_path = project_dir / "docs" / "solver_icon.ico"
     png_path = Path("docs/wordle_solver.png")
     if ico_path.exists():
         cmd.append(f"--icon={ico_path}")
@@ -53,7 +109,7 @@ def build_executable():
         result = subprocess.run(cmd, check=True, capture_output=True, text=True)
         print("GUI Build successful!")
         exe_name = "WordleSolver.exe" if sys.platform == "win32" else "WordleSolver"
-        print(f"GUI Executable created in: {project_dir / 'dist' / exe_name}")
+        print(f"GUI Executable created in: {project_dir / (SLIM_DIST if slim else 'dist') / exe_name}")
         return True
     except subprocess.CalledProcessError as e:
         print(f"GUI Build failed: {e}")
@@ -61,10 +117,10 @@ def build_executable():
         print(f"stderr: {e.stderr}")
         return False
 
-def build_cli_executable():
+def build_cli_executable(slim=False):
     """Build the CLI executable"""
     
-    print("Building Wordle Solver CLI v1.0.0 executable...")
+    print(f"Building Wordle Solver CLI v1.0.0 {'slim ' if slim else ''}executable...")
     
     # Use different separators based on platform for PyInstaller
     separator = ";" if sys.platform == "win32" else ":"
@@ -74,11 +130,8 @@ def build_cli_executable():
         "--onefile",
         "--console",
         "--name=WordleSolverCLI",
-        f"--add-data=wordle_list.txt{separator}.",
         "--paths=.",
-        "--collect-data=wordfreq",
-        "--hidden-import=numpy",
-        "--hidden-import=wordfreq",
+        *_bundle_args(separator, slim, excludes=["tkinter"]),
         "cli.py"
     ]
     
@@ -88,7 +141,7 @@ def build_cli_executable():
         result = subprocess.run(cmd, check=True, capture_output=True, text=True)
         print("CLI Build successful!")
         exe_name = "WordleSolverCLI.exe" if sys.platform == "win32" else "WordleSolverCLI"
-        print(f"CLI Executable created in: {Path.cwd() / 'dist' / exe_name}")
+        print(f"CLI Executable created in: {Path.cwd() / (SLIM_DIST if slim else 'dist') / exe_name}")
         return True
     except subprocess.CalledProcessError as e:
         print(f"CLI Build failed: {e}")
@@ -103,19 +156,56 @@ def ensure_pyinstaller():
     print("[error] PyInstaller not found in PATH. Install with: pip install pyinstaller")
     return False
 
+def _median_run_time(exe, args, runs=COLD_START_RUNS):
+    """Median wall time of fresh launches; each one-file launch unpacks its bundle again."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([str(exe), *args], check=True, capture_output=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def report_cli(executables):
+    """Print size and cold-start times for each built CLI executable (label -> path)."""
+    print("\nCLI size and cold start (median of %d launches):" % COLD_START_RUNS)
+    print(f"  {'build':<6} {'size':>9} {'--version':>10} {'1 suggestion':>13}")
+    for label, exe in executables.items():
+        if not exe.is_file():
+            print(f"  {label:<6} (not built)")
+            continue
+        # Untimed first run builds the per-user pattern matrix, a one-off for either build
+        subprocess.run([str(exe), *ONE_SUGGESTION_ARGS], check=True, capture_output=True)
+        size_mb = exe.stat().st_size / (1024 * 1024)
+        version_s = _median_run_time(exe, ["--version"])
+        suggest_s = _median_run_time(exe, ONE_SUGGESTION_ARGS)
+        print(f"  {label:<6} {size_mb:>6.1f} MB {version_s:>9.2f}s {suggest_s:>12.2f}s")
+
 def main():
+    parser = argparse.ArgumentParser(description="Build Wordle Solver executables with PyInstaller")
+    parser.add_argument("--slim", action="store_true",
+                        help="Bundle precomputed tables instead of wordfreq (output in dist/slim)")
+    parser.add_argument("--compare", action="store_true",
+                        help="Build the CLI both ways and report size and cold-start time")
+    args = parser.parse_args()
+
     if not ensure_pyinstaller():
         sys.exit(1)
 
+    exe_name = "WordleSolverCLI.exe" if sys.platform == "win32" else "WordleSolverCLI"
+    if args.compare:
+        ok = build_cli_executable() and build_cli_executable(slim=True)
+        report_cli({"full": Path("dist") / exe_name, "slim": SLIM_DIST / exe_name})
+        sys.exit(0 if ok else 1)
+
     success = True
 
-    if not build_cli_executable():
+    if not build_cli_executable(args.slim):
         success = False
 
     print("\nAttempting to build GUI executable...")
     try:
         import tkinter  # noqa: F401
-        if not build_executable():
+        if not build_executable(args.slim):
             success = False
     except ImportError:
         print("⚠️  Tkinter not available - skipping GUI executable build")
@@ -123,13 +213,14 @@ def main():
 
     if success:
         print("\n✅ All available builds completed successfully!")
-        dist_dir = Path("dist")
+        dist_dir = SLIM_DIST if args.slim else Path("dist")
         if dist_dir.exists():
             print("\nBuilt executables:")
             for exe in dist_dir.glob("*"):
                 if exe.is_file():
                     size_mb = exe.stat().st_size / (1024 * 1024)
                     print(f"  - {exe.name} ({size_mb:.1f} MB)")
+        report_cli({"slim" if args.slim else "full": dist_dir / exe_name})
     else:
         print("\n❌ Some builds failed. See messages above.")
         sys.exit(1)
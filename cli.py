@@ -1,35 +1,322 @@
 # cli.py
 import argparse
-from collections import defaultdict
-from wordlist import load_wordle_list
-from feedback import update_constraints
-from solver import rank_suggestions, filter_candidates
+import cProfile
+import json
+import os
+import pstats
+import re
+import sys
+from wordlist import load_answer_list, load_wordle_list, get_frequency, get_frequency_index
+from game_state import GameState
+from solver import (
+    MULTI_BOARD_OBJECTIVES, rank_multi_board, rank_suggestions_lookahead, rank_suggestions_partitioned,
+    rank_suggestions_sampled, rank_within_budget,
+)
+from opening_book import get_opening_book
+from decision_tree import get_decision_tree
+from metrics import metrics
+from suggestion_cache import CACHE_FILENAME, DEFAULT_MAX_BYTES, SuggestionCache
+from word_index import get_word_trie
 from version import __version__
 
+GUESS_PATTERN = re.compile(r"[a-z]{5}")
+FEEDBACK_PATTERN = re.compile(r"[GYB]{5}")
+
+def solve(wordle_list, history, workers=1, chunk_size=None, time_budget=None, max_evaluations=None,
+          sample_size=None, lookahead=None, dedup=False, cache=None, answers=None):
+    """Replay (guess, feedback) pairs; returns remaining candidates, top suggestions and
+    whether they are final (False when a time or evaluation budget cut ranking short).
+
+    With a SuggestionCache, complete rankings are looked up and stored by game state.
+    With answers, candidates come from that pool and every word is scored as a guess;
+    lookahead and sampled ranking only score the candidates, so they reject it."""
+    if answers is not None and (lookahead or sample_size):
+        raise ValueError("answers works with the exact, dedup and budgeted rankings")
+    state = GameState(wordle_list, answers)
+    for guess, feedback in history:
+        state.apply(guess, feedback)
+    candidates = state.candidates
+    greens, yellows, grays, guesses = state.greens, state.yellows, state.grays, state.guesses
+
+    # The tree and book hold one-step rankings with every word as a possible answer,
+    # so lookahead and sampled ranking always compute their own
+    precomputed = answers is None and not (lookahead or sample_size)
+    tree = get_decision_tree() if precomputed else None
+    if tree and tree.words == wordle_list:
+        word = tree.suggest(history)
+        if word is not None:
+            return candidates, [(word, 0.0, 0.0, get_frequency(word))], True
+
+    # Opening states are identical for every user; serve them from the book when present
+    book = get_opening_book() if precomputed else None
+    if book and book.words != wordle_list:
+        book = None
+    suggestions = None
+    if book and not history:
+        suggestions = book.first()
+    elif book and len(history) == 1:
+        suggestions = book.second(*history[0])
+    if suggestions is not None:
+        return candidates, suggestions, True
+    if dedup:
+        # Same results as rank_suggestions, so it shares the cache entry
+        kind, rank = "rank", lambda: rank_suggestions_partitioned(
+            candidates, greens, yellows, grays, guesses=guesses
+        ).top5
+    elif lookahead:
+        kind, rank = ("lookahead", lookahead), lambda: rank_suggestions_lookahead(
+            candidates, greens, yellows, grays, lookahead
+        ).top5
+    elif sample_size:
+        kind, rank = ("sampled", sample_size), lambda: rank_suggestions_sampled(
+            candidates, greens, yellows, grays, sample_size
+        ).top5
+    elif time_budget is not None or max_evaluations is not None:
+        # Budgeted results may be partial, so they are never cached
+        snapshot = rank_within_budget(candidates, greens, yellows, grays, time_budget, max_evaluations, guesses)
+        return candidates, snapshot.top5, snapshot.complete
+    else:
+        kind, rank = "rank", lambda: state.suggestions(workers, chunk_size)
+    if cache is not None:
+        guess_mask = None
+        if guesses is not None:
+            # The surviving answers do not fix the grays and yellows that limit the guesses
+            kind, guess_mask = (kind, "all-guesses"), state.consistent
+        key = cache.key(wordle_list, state.step.indices, kind, guess_mask)
+        return candidates, cache.get_or_compute(key, rank), True
+    return candidates, rank(), True
+
+def solve_multi(wordle_list, history, boards, objective="entropy"):
+    """Replay (guess, [feedback per board]) pairs over several boards (Dordle, Quordle, ...).
+
+    Returns each board's remaining candidates (None once solved) and the top joint
+    suggestions over the unsolved boards.
+    """
+    states = [GameState(wordle_list) for _ in range(boards)]
+    solved = [False] * boards
+    for guess, feedbacks in history:
+        if len(feedbacks) != boards:
+            raise ValueError(f"expected {boards} feedbacks for {guess!r}, got {len(feedbacks)}")
+        for i, feedback in enumerate(feedbacks):
+            if solved[i]:
+                continue
+            if feedback == "GGGGG":
+                solved[i] = True
+            else:
+                states[i].apply(guess, feedback)
+    remaining = [None if done else state.candidates for state, done in zip(states, solved)]
+    return remaining, rank_multi_board([r for r in remaining if r is not None], objective)
+
+def _check_step(guess, feedbacks):
+    """Normalized (guess, feedbacks); ValueError unless the guess is five letters a-z
+    and each feedback five of G/Y/B."""
+    guess, feedbacks = guess.lower(), [f.upper() for f in feedbacks]
+    if not GUESS_PATTERN.fullmatch(guess) or not all(FEEDBACK_PATTERN.fullmatch(f) for f in feedbacks):
+        raise ValueError(f"invalid step: {guess!r} / {feedbacks!r} (expected 5 letters and 5 of G/Y/B)")
+    return guess, feedbacks
+
+def _parse_history(record, boards=None):
+    """(guess, feedback) pairs; with boards, feedback is a list with one string per board."""
+    history = []
+    for step in record.get("history", []):
+        guess, feedback = (step["guess"], step["feedback"]) if isinstance(step, dict) else step
+        guess, feedbacks = _check_step(guess, feedback if boards else [feedback])
+        history.append((guess, feedbacks if boards else feedbacks[0]))
+    return history
+
+def format_result(candidates, suggestions, complete):
+    """JSON-ready fields shared by --batch output and the solver service."""
+    return {
+        "remaining": len(candidates),
+        "complete": complete,
+        "suggestions": [
+            {"word": word, "score": score, "entropy": entropy, "frequency": freq}
+            for word, score, entropy, freq in suggestions
+        ],
+    }
+
+def run_batch(stream, out, wordle_list, workers=1, chunk_size=None, time_budget=None, max_evaluations=None,
+              sample_size=None, lookahead=None, dedup=False, cache=None, answers=None):
+    """Answer one JSONL game record per input line, flushing each result as it is ready."""
+    for line in stream:
+        if not line.strip():
+            continue
+        result = {}
+        try:
+            record = json.loads(line)
+            result["id"] = record.get("id")
+            boards = record.get("boards")
+            if boards:
+                remaining, suggestions = solve_multi(
+                    wordle_list, _parse_history(record, boards), boards, record.get("objective", "entropy")
+                )
+            else:
+                candidates, suggestions, complete = solve(
+                    wordle_list, _parse_history(record), workers, chunk_size, time_budget, max_evaluations,
+                    sample_size, lookahead, dedup, cache, answers,
+                )
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            result["error"] = str(e)
+        else:
+            if boards:
+                result.update(format_result([], suggestions, True))
+                result["remaining"] = [None if r is None else len(r) for r in remaining]
+            else:
+                result.update(format_result(candidates, suggestions, complete))
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+
 def main():
     parser = argparse.ArgumentParser(description=f"Wordle Solver CLI v{__version__}")
     parser.add_argument("--guess", type=str, help="Your guess word (5 letters)")
-    parser.add_argument("--feedback", type=str, help="Feedback string (e.g. BYGBY)")
+    parser.add_argument("--feedback", type=str,
+                        help="Feedback string (e.g. BYGBY); comma-separated, one per board, for multi-board play")
+    parser.add_argument("--objective", choices=MULTI_BOARD_OBJECTIVES, default="entropy",
+                        help="Multi-board score: summed entropy, or expected boards left with one candidate")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="FILE",
+                        help="Read JSONL game histories from FILE (or stdin) and stream JSONL results")
+    parser.add_argument("--workers", type=int, default=1, help="Processes used to rank suggestions (default 1)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Guesses scored per parallel task")
+    parser.add_argument("--time-budget-ms", type=float, default=None,
+                        help="Return the best suggestions found within this many milliseconds")
+    parser.add_argument("--max-evaluations", type=int, default=None,
+                        help="Score at most this many guesses (most promising first)")
+    parser.add_argument("--sampled", type=int, default=None, metavar="M",
+                        help="Estimate entropy from M sampled candidates, re-scoring close calls exactly")
+    parser.add_argument("--lookahead", type=int, default=None, metavar="K",
+                        help="Re-rank the top K guesses by two-step (this turn + next turn) entropy")
+    parser.add_argument("--dedup", action="store_true",
+                        help="Diagnostic: score each distinct partition once (same results, slower)")
+    parser.add_argument("--most-frequent", type=int, default=None, metavar="K",
+                        help="List the K most frequent words (see --exclude) and exit")
+    parser.add_argument("--exclude", type=str, default="", metavar="LETTERS",
+                        help="With --most-frequent, skip words containing any of these letters")
+    parser.add_argument("--match", type=str, default=None, metavar="PATTERN",
+                        help="List words matching PATTERN (? = any letter, e.g. cr?n?), labelled against "
+                             "--guess/--feedback when given")
+    parser.add_argument("--answers", nargs="?", const="", default=None, metavar="FILE",
+                        help="Treat only words in FILE (default: the 3,000 most frequent words) as possible "
+                             "answers, still scoring every word as a guess")
+    parser.add_argument("--cache", nargs="?", const="", default=None, metavar="PATH",
+                        help=f"Reuse rankings across runs from an SQLite cache (default {CACHE_FILENAME})")
+    parser.add_argument("--cache-max-mb", type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                        help="Evict least recently used entries beyond this size")
+    parser.add_argument("--cache-stats", action="store_true", help="Print cache hit/miss statistics to stderr")
+    parser.add_argument("--metrics-out", type=str, default=None, metavar="FILE",
+                        help="Write solver counters and timers to FILE (Prometheus text for .prom/.txt, else JSON)")
+    parser.add_argument("--profile", type=str, default=None, metavar="FILE",
+                        help="Profile the run with cProfile, dump pstats to FILE and print the top entries")
     parser.add_argument("--version", action="version", version=f"Wordle Solver v{__version__}")
     args = parser.parse_args()
+    for flag, value in (("--max-evaluations", args.max_evaluations), ("--sampled", args.sampled),
+                        ("--lookahead", args.lookahead), ("--most-frequent", args.most_frequent)):
+        if value is not None and value < 1:
+            parser.error(f"{flag} needs a value of at least 1")
+    if args.answers is not None and (args.sampled or args.lookahead):
+        parser.error("--answers works with the exact, --dedup and budgeted rankings")
+    if args.answers and not os.path.isfile(args.answers):
+        parser.error(f"--answers file not found: {args.answers}")
+    if not re.fullmatch(r"[a-z]*", args.exclude.lower()):
+        parser.error("--exclude takes letters a-z only")
 
-    if not args.guess or not args.feedback or len(args.guess) != 5 or len(args.feedback) != 5:
-        print("Usage: python cli.py --guess crane --feedback BYGBY")
+    if args.metrics_out:
+        metrics.enable()
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    try:
+        run(args)
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(20)
+        if args.metrics_out:
+            metrics.write(args.metrics_out)
+
+def run(args):
+    time_budget = args.time_budget_ms / 1000 if args.time_budget_ms is not None else None
+    budget = (
+        args.workers, args.chunk_size, time_budget, args.max_evaluations, args.sampled, args.lookahead, args.dedup
+    )
+    cache = None
+    if args.cache is not None:
+        cache = SuggestionCache(args.cache or None, int(args.cache_max_mb * 1024 * 1024))
+    answers = None
+    if args.answers is not None:
+        answers = load_answer_list(args.answers or None)
+    budget += (cache, answers)
+    try:
+        _run(args, budget)
+    finally:
+        if cache is not None:
+            if args.cache_stats:
+                print(json.dumps(cache.stats()), file=sys.stderr)
+            cache.close()
+
+def _run(args, budget):
+
+    if args.most_frequent is not None:
+        for word, freq in get_frequency_index().top_k(args.most_frequent, args.exclude.lower()):
+            print(f"{word.upper():<8} Freq: {freq:.6f}")
+        return
+
+    if args.match:
+        wordle_list = load_wordle_list()
+        state = GameState(wordle_list)
+        if args.guess and args.feedback:
+            try:
+                guess, (feedback,) = _check_step(args.guess, [args.feedback])
+            except ValueError as e:
+                print(f"Error: {e}")
+                return
+            state.apply(guess, feedback)
+        trie = get_word_trie()
+        for i in trie.match(args.match):
+            print(f"{trie.words[i].upper():<8} {'consistent' if state.consistent[i] else 'inconsistent'}")
+        return
+
+    if args.batch:
+        wordle_list = load_wordle_list()
+        if args.batch == "-":
+            run_batch(sys.stdin, sys.stdout, wordle_list, *budget)
+        else:
+            with open(args.batch, 'r') as f:
+                run_batch(f, sys.stdout, wordle_list, *budget)
+        return
+
+    feedbacks = args.feedback.split(",") if args.feedback else []
+    if not args.guess or not feedbacks:
+        print("Usage: python cli.py --guess crane --feedback BYGBY  (or BYGBY,GGBBB,... for several boards)")
+        return
+    try:
+        guess, feedbacks = _check_step(args.guess, feedbacks)
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Usage: python cli.py --guess crane --feedback BYGBY  (or BYGBY,GGBBB,... for several boards)")
         return
 
     wordle_list = load_wordle_list()
-    candidates = wordle_list.copy()
-    greens = {}
-    yellows = defaultdict(set)
-    grays = set()
+    if len(feedbacks) > 1:
+        remaining, suggestions = solve_multi(
+            wordle_list, [(guess, feedbacks)], len(feedbacks), args.objective
+        )
+        print()
+        for i, board in enumerate(remaining, 1):
+            print(f"Board {i}: " + ("solved" if board is None else f"{len(board)} remaining"))
+        label = "Joint entropy" if args.objective == "entropy" else "Boards solved"
+        print("Top suggestions:")
+        for word, score, value, freq in suggestions:
+            print(f"{word.upper():<8} Score: {score:.6f} | {label}: {value:.3f} | Freq: {freq:.6f}")
+        return
 
-    update_constraints(args.guess.lower(), args.feedback.upper(), greens, yellows, grays)
-    candidates = filter_candidates(candidates, args.guess.lower(), args.feedback.upper(), greens, yellows, grays)
+    history = [(guess, feedbacks[0])]
+    candidates, suggestions, complete = solve(wordle_list, history, *budget)
 
     print(f"\nRemaining candidates: {len(candidates)}")
-    print("Top suggestions:")
-    for word, score, entropy, freq in rank_suggestions(candidates, greens, yellows, grays):
+    print("Top suggestions:" if complete else "Top suggestions (budget reached, best found so far):")
+    for word, score, entropy, freq in suggestions:
         print(f"{word.upper():<8} Score: {score:.6f} | Entropy: {entropy:.3f} | Freq: {freq:.6f}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
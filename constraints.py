@@ -0,0 +1,60 @@
+# constraints.py
+import numpy as np
+from wordlist import load_word_array, load_wordle_list, words_to_array
+
+MAX_COUNT = 5
+
+_default_index = None
+
+
+def _letter(ch):
+    return ord(ch) - 97
+
+
+class ConstraintIndex:
+    """Per-letter bitsets over a word list, so hard-mode checks become array ANDs.
+
+    at[pos, letter] marks words with letter at pos; at_least[letter, k] marks
+    words containing letter at least k times (k = 1..MAX_COUNT).
+    """
+
+    def __init__(self, words, letters=None):
+        self.words = words
+        if letters is None:
+            letters = words_to_array(words)
+        letters = letters.astype(np.intp) - 97
+        n = len(words)
+        self.at = np.zeros((5, 26, n), dtype=bool)
+        for pos in range(5):
+            self.at[pos, letters[:, pos], np.arange(n)] = True
+        counts = self.at.sum(axis=0)
+        self.at_least = np.stack([counts >= k for k in range(MAX_COUNT + 1)], axis=1)
+
+    def __len__(self):
+        return len(self.words)
+
+    def mask(self, greens, yellows, grays):
+        """Boolean mask of words passing feedback.enforce_hard_mode."""
+        mask = np.ones(len(self.words), dtype=bool)
+        for i, g in greens.items():
+            mask &= self.at[i, _letter(g)]
+        for letter, positions in yellows.items():
+            mask &= self.at_least[_letter(letter), 1]
+            for pos in positions:
+                mask &= ~self.at[pos, _letter(letter)]
+        # Gray letters only exclude when not confirmed green or yellow
+        confirmed = set(greens.values()) | set(yellows)
+        for letter in grays:
+            if letter not in confirmed:
+                mask &= ~self.at_least[_letter(letter), 1]
+        return mask
+
+    def surviving(self, greens, yellows, grays):
+        return np.flatnonzero(self.mask(greens, yellows, grays))
+
+
+def get_constraint_index():
+    global _default_index
+    if _default_index is None:
+        _default_index = ConstraintIndex(load_wordle_list(), load_word_array())
+    return _default_index
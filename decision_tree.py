@@ -0,0 +1,262 @@
+# decision_tree.py
+"""Search for a guess tree that minimizes expected (or worst-case) guesses, and follow it.
+
+    python decision_tree.py --objective expected --beam 8 --time-budget 120
+
+Guesses are restricted to the remaining candidates, which keeps every move legal
+in hard mode. Subproblems are memoized on the sorted candidate index array.
+"""
+import argparse
+import os
+import struct
+import time
+from collections import deque
+import numpy as np
+from patterns import ALL_GREEN, encode_feedback, get_pattern_matrix
+from solver import batch_entropy
+from wordlist import load_wordle_list, word_list_hash
+
+TREE_FILENAME = "decision_tree.bin"
+TREE_MAGIC = b"WDTR"
+TREE_VERSION = 1
+# magic, format version, node count, edge count, sha256 of the word list; padded to 64 bytes
+_HEADER = struct.Struct("<4sIII32s")
+HEADER_SIZE = 64
+NODE = np.dtype([('guess', '<u2'), ('first_edge', '<u4'), ('num_edges', 'u1')])
+EDGE = np.dtype([('pattern', 'u1'), ('child', '<u4')])
+
+_default_tree = None
+
+
+class TreeSearch:
+    """Branch-and-bound over the top `beam` entropy guesses of each candidate set.
+
+    Once the node or time budget runs out the search degrades to the single best
+    entropy guess per set, so it always returns a complete tree.
+    """
+
+    def __init__(self, matrix, objective="expected", beam=8, max_nodes=None, time_budget=None):
+        if objective not in ("expected", "worst"):
+            raise ValueError(f"Unknown objective: {objective}")
+        self.matrix = matrix
+        self.objective = objective
+        self.beam = beam
+        self.max_nodes = max_nodes
+        self.deadline = time.perf_counter() + time_budget if time_budget else None
+        self.memo = {}
+        self.subproblems = 0
+        self.pruned = 0
+        self.exact = True
+
+    def _exhausted(self):
+        if self.max_nodes is not None and self.subproblems >= self.max_nodes:
+            return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def _lower_bound(self, size):
+        # Best case: the guess is the answer, or it splits everything into singletons
+        if self.objective == "expected":
+            return 2 * size - 1
+        return 1 if size == 1 else 2
+
+    def _partition(self, guess, candidates):
+        codes = self.matrix[guess, candidates]
+        order = np.argsort(codes, kind='stable')
+        codes = codes[order]
+        bounds = np.flatnonzero(np.diff(codes)) + 1
+        return [
+            candidates[np.sort(group)]
+            for group, code in zip(np.split(order, bounds), codes[np.r_[0, bounds]])
+            if code != ALL_GREEN
+        ]
+
+    def solve(self, candidates):
+        """Cost of the best tree for a sorted candidate index array; memoized."""
+        n = len(candidates)
+        if n == 1:
+            return 1
+        if n == 2:
+            return 3 if self.objective == "expected" else 2
+        key = candidates.tobytes()
+        if key in self.memo:
+            return self.memo[key][0]
+        self.subproblems += 1
+
+        width = self.beam
+        if self._exhausted():
+            self.exact = False
+            width = 1
+        entropies = batch_entropy(candidates, candidates, self.matrix)
+        guesses = candidates[np.argsort(-entropies, kind='stable')[:width]]
+
+        best_cost, best_guess = float('inf'), guesses[0]
+        for guess in guesses:
+            buckets = sorted(self._partition(guess, candidates), key=len, reverse=True)
+            bounds = [self._lower_bound(len(b)) for b in buckets]
+            if self.objective == "expected":
+                cost = n + sum(bounds)
+                if cost >= best_cost:
+                    self.pruned += 1
+                    continue
+                for bucket, bound in zip(buckets, bounds):
+                    cost += self.solve(bucket) - bound
+                    if cost >= best_cost:
+                        self.pruned += 1
+                        break
+            else:
+                cost = 1 + max(bounds, default=0)
+                if cost >= best_cost:
+                    self.pruned += 1
+                    continue
+                for bucket in buckets:
+                    cost = max(cost, 1 + self.solve(bucket))
+                    if cost >= best_cost:
+                        self.pruned += 1
+                        break
+            if cost < best_cost:
+                best_cost, best_guess = cost, guess
+        self.memo[key] = (best_cost, int(best_guess))
+        return best_cost
+
+    def best_guess(self, candidates):
+        if len(candidates) <= 2:
+            return int(candidates[0])
+        self.solve(candidates)
+        return self.memo[candidates.tobytes()][1]
+
+    def build(self, candidates, root=None):
+        """Solve and flatten the tree into NODE/EDGE arrays (node 0 is the root)."""
+        candidates = np.sort(np.asarray(candidates, dtype=np.intp))
+        nodes, edges = [], []
+        queue = deque([(candidates, root)])
+        while queue:
+            subset, guess = queue.popleft()
+            if guess is None:
+                guess = self.best_guess(subset)
+            buckets = self._partition(guess, subset)
+            nodes.append((guess, len(edges), len(buckets)))
+            # Buckets come out in ascending pattern order, which child() relies on
+            for bucket in buckets:
+                code = int(self.matrix[guess, bucket[0]])
+                # Children are queued in order, so their node ids are predictable
+                edges.append((code, len(nodes) + len(queue)))
+                queue.append((bucket, None))
+        return np.array(nodes, dtype=NODE), np.array(edges, dtype=EDGE)
+
+
+class DecisionTree:
+    """A flattened guess tree; each turn is one edge lookup."""
+
+    def __init__(self, words, nodes, edges):
+        self.words = words
+        self.nodes = nodes
+        self.edges = edges
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def child(self, node, feedback):
+        """Node reached from node on feedback, or None if the tree has no such branch."""
+        code = encode_feedback(feedback)
+        start = int(self.nodes[node]['first_edge'])
+        patterns = self.edges['pattern'][start:start + int(self.nodes[node]['num_edges'])]
+        pos = int(np.searchsorted(patterns, code))
+        if pos < len(patterns) and patterns[pos] == code:
+            return int(self.edges[start + pos]['child'])
+        return None
+
+    def suggest(self, history):
+        """Next guess after (guess, feedback) pairs, or None once play leaves the tree."""
+        node = 0
+        for guess, feedback in history:
+            if self.words[self.nodes[node]['guess']] != guess:
+                return None
+            node = self.child(node, feedback)
+            if node is None:
+                return None
+        return self.words[self.nodes[node]['guess']]
+
+
+def save_tree(words, nodes, edges, path):
+    header = _HEADER.pack(TREE_MAGIC, TREE_VERSION, len(nodes), len(edges), word_list_hash(words))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header.ljust(HEADER_SIZE, b'\0'))
+        f.write(nodes.tobytes())
+        f.write(edges.tobytes())
+    os.replace(tmp_path, path)
+
+
+def load_tree(words, path):
+    """Read a tree file, or None if it is missing or built for another word list."""
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except OSError:
+        return None
+    if len(raw) < HEADER_SIZE:
+        return None
+    magic, version, n_nodes, n_edges, key = _HEADER.unpack_from(raw)
+    expected_size = HEADER_SIZE + n_nodes * NODE.itemsize + n_edges * EDGE.itemsize
+    if (magic, version, key) != (TREE_MAGIC, TREE_VERSION, word_list_hash(words)) or len(raw) != expected_size:
+        return None
+    nodes = np.frombuffer(raw, dtype=NODE, count=n_nodes, offset=HEADER_SIZE)
+    edges = np.frombuffer(raw, dtype=EDGE, count=n_edges, offset=HEADER_SIZE + nodes.nbytes)
+    return DecisionTree(words, nodes, edges)
+
+
+def _tree_path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), TREE_FILENAME)
+
+
+def get_decision_tree():
+    """Tree for the default word list, or None when it has not been generated."""
+    global _default_tree
+    if _default_tree is None:
+        _default_tree = load_tree(load_wordle_list(), _tree_path())
+    return _default_tree
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build an optimal guess decision tree")
+    parser.add_argument("--objective", choices=("expected", "worst"), default="expected")
+    parser.add_argument("--beam", type=int, default=8, help="Guesses tried per candidate set (default 8)")
+    parser.add_argument("--max-nodes", type=int, default=None, help="Stop branching after N subproblems")
+    parser.add_argument("--time-budget", type=float, default=None, help="Stop branching after N seconds")
+    parser.add_argument("--root", type=str, default=None, help="Fix the first guess")
+    parser.add_argument("--out", type=str, default=_tree_path())
+    args = parser.parse_args()
+
+    words = load_wordle_list()
+    pm = get_pattern_matrix()
+    search = TreeSearch(pm.matrix, args.objective, args.beam, args.max_nodes, args.time_budget)
+    start = time.perf_counter()
+    root = pm.index[args.root.lower()] if args.root else None
+    nodes, edges = search.build(np.arange(len(words)), root)
+    save_tree(words, nodes, edges, args.out)
+
+    tree = DecisionTree(words, nodes, edges)
+    depths = _depths(tree)
+    print(f"Tree written to {args.out}: {len(nodes)} nodes, root {tree.suggest([]).upper()}")
+    print(f"Expected guesses: {np.mean(depths):.4f} | Worst case: {max(depths)} | "
+          f"{'exact within beam' if search.exact else 'budget reached (greedy below cutoff)'}")
+    print(f"Subproblems: {search.subproblems} | Pruned branches: {search.pruned} | "
+          f"{time.perf_counter() - start:.1f}s")
+
+
+def _depths(tree):
+    """Guesses needed for every answer reachable in the tree."""
+    depths = []
+    stack = [(0, 1)]
+    while stack:
+        node, depth = stack.pop()
+        start = int(tree.nodes[node]['first_edge'])
+        edges = tree.edges[start:start + int(tree.nodes[node]['num_edges'])]
+        # Every node's guess is itself a possible answer solved at this depth
+        depths.append(depth)
+        stack.extend((int(child), depth + 1) for child in edges['child'])
+    return depths
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
 # feedback.py
 from collections import defaultdict
+import numpy as np
+from metrics import metrics, timed
+from patterns import encode_feedback, pattern_block
 
+@timed("get_feedback")
 def get_feedback(guess, solution):
     feedback = ['B'] * 5
     solution_used = [False] * 5
@@ -18,8 +22,31 @@ def get_feedback(guess, solution):
                 break
     return ''.join(feedback)
 
+@timed("feedback_codes")
+def feedback_codes(guess, solutions):
+    """Base-3 pattern codes of guess against every row of an N x 5 letter array.
+
+    Same rules as get_feedback: greens first, then yellows limited by the copies of
+    each letter the solution has left over.
+    """
+    metrics.incr("feedback_codes_cells", len(solutions))
+    g = np.frombuffer(guess.encode('ascii'), dtype=np.uint8)
+    green = solutions == g
+    codes = np.zeros(len(solutions), dtype=np.uint8)
+    for i in range(5):
+        # Copies not taken by greens, minus those claimed by earlier non-green copies in the guess
+        available = ((solutions == g[i]) & ~green).sum(axis=1)
+        claimed = (~green[:, :i] & (g[:i] == g[i])).sum(axis=1)
+        yellow = ~green[:, i] & (available > claimed)
+        codes = codes * 3 + np.where(green[:, i], 2, yellow).astype(np.uint8)
+    return codes
+
+def filter_by_pattern(guess, feedback, solutions):
+    """Row indices of an N x 5 letter array that would give this feedback for guess."""
+    return np.flatnonzero(feedback_codes(guess, solutions) == encode_feedback(feedback))
+
 def matches_feedback(guess, candidate, feedback):
-    return get_feedback(guess, candidate) == feedback
+    return bool(pattern_block([guess], [candidate])[0, 0] == encode_feedback(feedback))
 
 def enforce_hard_mode(word, greens, yellows, grays):
     for i, g in greens.items():
@@ -0,0 +1,183 @@
+# game_state.py
+from collections import namedtuple
+import numpy as np
+from metrics import metrics, timed
+from feedback import feedback_codes, update_constraints
+from patterns import encode_feedback, get_pattern_matrix, words_to_array
+from solver import _hard_mode_mask, rank_suggestions
+
+# One applied guess. Steps are never mutated after they are pushed (apart from
+# their cache), so undo is a pop and a snapshot is just a reference.
+Step = namedtuple("Step", ["guess", "feedback", "indices", "greens", "yellows", "grays", "mode", "cache"])
+
+
+class GameState:
+    """A single game: applied guesses, surviving candidates and the hard-mode constraints.
+
+    Candidates are an index array into words that each guess narrows, rather than a
+    rescan of the whole list. Every guess pushes a Step; undo pops it onto a redo stack.
+    Suggestions are memoized per step, so undo/redo and repeated requests are free.
+
+    With answers (a subset of words), only they are tracked as candidates while all of
+    words remain guesses; if the feedback rules out every answer, the game carries on
+    over the full list.
+    """
+
+    def __init__(self, words, answers=None):
+        self.words = words
+        self.answers = answers
+        pm = get_pattern_matrix()
+        # Rows of words in the default pattern matrix, or None for an ad hoc list
+        self._rows = pm.indices(words)
+        self._letters = None
+        if answers is None:
+            indices = np.arange(len(words))
+        else:
+            allowed = set(answers)
+            indices = np.flatnonzero([w in allowed for w in words])
+        root = Step(None, None, indices, {}, {}, frozenset(), "entropy", {})
+        self._steps = [root]
+        self._redo = []
+
+    @property
+    def step(self):
+        return self._steps[-1]
+
+    @property
+    def candidates(self):
+        step = self.step
+        if "candidates" not in step.cache:
+            if step.guess is None and self.answers is None:
+                step.cache["candidates"] = self.words
+            else:
+                step.cache["candidates"] = [self.words[i] for i in step.indices]
+        return step.cache["candidates"]
+
+    @property
+    def candidate_set(self):
+        """The candidates as a set, built once per step so membership checks are O(1)."""
+        step = self.step
+        if "candidate_set" not in step.cache:
+            step.cache["candidate_set"] = frozenset(self.candidates)
+        return step.cache["candidate_set"]
+
+    @property
+    def consistent(self):
+        """Mask over all words of those passing hard mode for the current greens, yellows and grays."""
+        step = self.step
+        if "consistent" not in step.cache:
+            words = self.words if self._rows is None else None
+            step.cache["consistent"] = _hard_mode_mask(words, self._rows, step.greens, step.yellows, step.grays)
+        return step.cache["consistent"]
+
+    @property
+    def greens(self):
+        return self.step.greens
+
+    @property
+    def yellows(self):
+        return self.step.yellows
+
+    @property
+    def grays(self):
+        return self.step.grays
+
+    @property
+    def mode(self):
+        return self.step.mode
+
+    @property
+    def history(self):
+        return [(s.guess, s.feedback) for s in self._steps[1:]]
+
+    def __len__(self):
+        return len(self.step.indices)
+
+    def _codes(self, guess, indices):
+        pm = get_pattern_matrix()
+        if self._rows is not None and guess in pm.index:
+            return pm.matrix[pm.index[guess], self._rows[indices]]
+        if self._letters is None:
+            self._letters = words_to_array(self.words)
+        return feedback_codes(guess, self._letters[indices])
+
+    @timed("game_state_apply")
+    def apply(self, guess, feedback):
+        """Narrow the candidates by one (guess, feedback) pair and push the new step."""
+        prev = self.step
+        greens = dict(prev.greens)
+        yellows = {letter: set(p) for letter, p in prev.yellows.items()}
+        grays = set(prev.grays)
+        update_constraints(guess, feedback, greens, yellows, grays)
+
+        indices = self._narrow(prev.indices, [(guess, feedback)], greens, yellows, grays)
+        if not len(indices) and self.answers is not None:
+            # The answer is outside the pool: replay the game over every word
+            metrics.incr("game_state_answer_pool_misses")
+            indices = self._narrow(np.arange(len(self.words)), self.history + [(guess, feedback)],
+                                   greens, yellows, grays)
+
+        # Fast mode: an all-gray opener leaves only absent letters to steer by
+        mode = "fast" if feedback == "BBBBB" and not greens and not yellows else "entropy"
+        metrics.incr("game_state_candidates_in", len(prev.indices))
+        metrics.incr("game_state_candidates_out", len(indices))
+        self._steps.append(Step(guess, feedback, indices, greens, yellows, frozenset(grays), mode, {}))
+        self._redo.clear()
+        return self
+
+    def _narrow(self, indices, history, greens, yellows, grays):
+        """indices consistent with every (guess, feedback) in history and hard mode."""
+        for guess, feedback in history:
+            indices = indices[self._codes(guess, indices) == encode_feedback(feedback)]
+        rows = self._rows[indices] if self._rows is not None else None
+        words = [self.words[i] for i in indices] if rows is None else None
+        # Constraints only accumulate, so the latest ones imply every earlier step's
+        return indices[_hard_mode_mask(words, rows, greens, yellows, grays)]
+
+    def undo(self):
+        """Drop the last guess; returns False when there is nothing to undo."""
+        if len(self._steps) == 1:
+            return False
+        self._redo.append(self._steps.pop())
+        return True
+
+    def redo(self):
+        """Re-apply the last undone guess, with its cached results intact."""
+        if not self._redo:
+            return False
+        self._steps.append(self._redo.pop())
+        return True
+
+    def restart(self):
+        del self._steps[1:]
+        self._redo.clear()
+
+    def cached(self, key, compute):
+        """compute(), memoized on the current step under key."""
+        cache = self.step.cache
+        if key in cache:
+            metrics.incr("game_state_cache_hits")
+        else:
+            metrics.incr("game_state_cache_misses")
+            cache[key] = compute()
+        return cache[key]
+
+    @property
+    def guesses(self):
+        """Words to score against the candidates, or None when the candidates are the guesses.
+
+        With an answer pool these are the hard-mode-valid words, so ranking never
+        re-checks the whole list.
+        """
+        if self.answers is None:
+            return None
+        step = self.step
+        if "guesses" not in step.cache:
+            step.cache["guesses"] = [self.words[i] for i in np.flatnonzero(self.consistent)]
+        return step.cache["guesses"]
+
+    def suggestions(self, workers=1, chunk_size=None):
+        """rank_suggestions for this step; the result is independent of workers, so it is cached once."""
+        return self.cached("rank", lambda: rank_suggestions(
+            self.candidates, self.greens, self.yellows, self.grays, workers, chunk_size, self.guesses
+        ))
@@ -1,17 +1,25 @@
 # main.py
+import argparse
+import time
 import tkinter as tk
-from collections import defaultdict
-from wordlist import load_wordle_list, get_frequency
-from feedback import get_feedback, update_constraints
-from solver import rank_suggestions, filter_candidates
+import numpy as np
+from wordlist import load_wordle_list, get_frequency, get_frequency_index
+from game_state import GameState
+from solver import iter_rank_suggestions
+from opening_book import get_opening_book
+from decision_tree import get_decision_tree
+from word_index import get_word_trie
+from worker import RankingJob
 from version import __version__
 
 wordle_list = load_wordle_list()
-candidates = wordle_list.copy()
-greens = {}
-yellows = defaultdict(set)
-grays = set()
-mode = "entropy"
+state = GameState(wordle_list)
+ranking_job = None
+POLL_MS = 50
+MAX_COMPLETIONS = 12
+# Optional latency budget for live ranking (set from the command line)
+time_budget = None
+max_evaluations = None
 fb_state = ['B'] * 5
 fb_display = {'G': '🟩', 'Y': '🟨', 'B': '⬜'}
 tile_colors = {'G': '#6aaa64', 'Y': '#c9b458', 'B': '#787c7e'}
@@ -19,7 +27,7 @@ tile_colors = {'G': '#6aaa64', 'Y': '#c9b458', 'B': '#787c7e'}
 
 root = tk.Tk()
 root.title(f"Wordle Solver v{__version__}")
-root.geometry("600x700")  # Wider default
+root.geometry("600x820")  # Taller default to fit the completions list
 root.columnconfigure(0, weight=1)
 
 letter_vars = [tk.StringVar() for _ in range(5)]
@@ -53,14 +61,12 @@ def reset_tile_colors():
     update_cursor_highlight()
 
 def apply():
-    global mode
     guess = ''.join([var.get().lower() for var in letter_vars])
     if len(guess) != 5:
         return
+    cancel_ranking()
     feedback = ''.join(fb_state)
-    update_constraints(guess, feedback, greens, yellows, grays)
-    global candidates
-    candidates = filter_candidates(candidates, guess, feedback, greens, yellows, grays)
+    state.apply(guess, feedback)
     guess_log.insert(tk.END, f"{guess.upper()} → {''.join([fb_display[f] for f in fb_state])}\n")
     for v in letter_vars:
         v.set("")
@@ -71,35 +77,105 @@ def apply():
         fb_state[i] = 'B'
         feedback_buttons[i].config(text=fb_display['B'], bg=tile_colors['B'])
     update_remaining()
+    auto_suggest()
+
+def undo():
+    cancel_ranking()
+    if state.undo():
+        replay_log()
+
+def redo():
+    cancel_ranking()
+    if state.redo():
+        replay_log()
 
-    # Switch to fast mode if first guess is all gray
-    if feedback == "BBBBB" and not greens and not yellows:
-        mode = "fast"
+def replay_log():
+    guess_log.delete(1.0, tk.END)
+    for guess, feedback in state.history:
+        guess_log.insert(tk.END, f"{guess.upper()} → {''.join(fb_display[f] for f in feedback)}\n")
+    update_remaining()
+    if state.history:
+        auto_suggest()
     else:
-        mode = "entropy"
+        top5_output.delete(1.0, tk.END)
 
-    auto_suggest()
+def cancel_ranking():
+    global ranking_job
+    if ranking_job is not None:
+        ranking_job.cancel()
+        ranking_job = None
+
+def start_ranking():
+    global ranking_job
+    cancel_ranking()
+    # Steps are immutable once applied, so the job can keep reading them after the game moves on
+    inputs = (state.candidates, state.greens, state.yellows, state.grays)
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+    ranking_job = RankingJob(
+        lambda: iter_rank_suggestions(*inputs, deadline=deadline, max_evaluations=max_evaluations)
+    ).start()
+    top5_output.delete(1.0, tk.END)
+    top5_output.insert(tk.END, "Scoring...\n")
+    root.after(POLL_MS, poll_ranking, ranking_job)
+
+def poll_ranking(job):
+    if job is not ranking_job or job.cancelled:
+        return
+    for kind, payload in job.poll():
+        if kind == "error":
+            guess_log.insert(tk.END, f"Ranking failed: {payload}\n")
+            cancel_ranking()
+            return
+        if kind == "done":
+            cancel_ranking()
+            if payload.complete:
+                # The job is cancelled whenever the game moves, so this is still the current step
+                state.cached("rank", lambda: payload.top5)
+            else:
+                guess_log.insert(tk.END, f"Budget reached after {payload.evaluated}/{payload.total} guesses\n")
+            show_suggestions(payload.top5)
+            return
+        show_top5(payload.top5, f"Scoring... {payload.evaluated}/{payload.total}\n")
+    root.after(POLL_MS, poll_ranking, job)
+
+def show_top5(top5, header=""):
+    top5_output.delete(1.0, tk.END)
+    top5_output.insert(tk.END, header)
+    for word, score, ent, freq in top5:
+        top5_output.insert(tk.END, f"{word.upper():<8} Score: {score:.6f} | Entropy: {ent:.3f} | Freq: {freq:.6f}\n")
 
 def auto_suggest():
-    if not candidates:
+    cancel_ranking()
+    if not state.candidates:
         guess_log.insert(tk.END, "No candidates remaining. Solver cannot proceed.\n")
         top5_output.delete(1.0, tk.END)
         top5_output.insert(tk.END, "No suggestions available.\n")
         return
 
-    if mode == "fast":
+    tree = get_decision_tree()
+    tree_word = tree.suggest(state.history) if tree else None
+    if tree_word is not None:
+        top5 = [(tree_word, 0, 0, get_frequency(tree_word))]
+        guess_log.insert(tk.END, "Decision tree move\n")
+    elif state.mode == "fast":
         # Fast mode: only filter by known absent letters (initial all-gray guess scenario)
-        filtered = [w for w in candidates if all(l not in w for l in grays)]
-        top5 = sorted(
-            [(w, get_frequency(w)) for w in filtered],
-            key=lambda x: x[1],
-            reverse=True
-        )[:5]
-        top5 = [(w, 0, 0, freq) for w, freq in top5]
-        guess_log.insert(tk.END, f"Fast mode: avoiding grays {', '.join(sorted(grays))}\n")
+        top5 = [(w, 0, 0, freq) for w, freq in get_frequency_index().top_k(5, state.grays)]
+        guess_log.insert(tk.END, f"Fast mode: avoiding grays {', '.join(sorted(state.grays))}\n")
     else:
-        top5 = rank_suggestions(candidates, greens, yellows, grays)
-
+        # Rankings already computed for this step (e.g. before an undo) are reused
+        top5 = state.step.cache.get("rank")
+        # Second-turn suggestions come from the opening book when it covers the opener
+        book = get_opening_book() if top5 is None and len(state.history) == 1 else None
+        if book:
+            top5 = book.second(*state.history[0])
+        if top5 is None:
+            # Live ranking runs off the Tk thread; results arrive via poll_ranking
+            start_ranking()
+            return
+
+    show_suggestions(top5)
+
+def show_suggestions(top5):
     if not top5:
         guess_log.insert(tk.END, "No valid suggestions.\n")
         top5_output.delete(1.0, tk.END)
@@ -108,17 +184,11 @@ def auto_suggest():
 
     animate_suggestion(top5[0][0])
     guess_log.insert(tk.END, f"Suggested: {top5[0][0].upper()} (Entropy: {top5[0][2]:.3f}, Freq: {top5[0][3]:.6f})\n")
-    top5_output.delete(1.0, tk.END)
-    for word, score, ent, freq in top5:
-        top5_output.insert(tk.END, f"{word.upper():<8} Score: {score:.6f} | Entropy: {ent:.3f} | Freq: {freq:.6f}\n")
+    show_top5(top5)
 
 def restart():
-    global candidates, greens, yellows, grays, mode
-    candidates = wordle_list.copy()
-    greens.clear()
-    yellows.clear()
-    grays.clear()
-    mode = "entropy"
+    cancel_ranking()
+    state.restart()
     for v in letter_vars:
         v.set("")
     guess_log.delete(1.0, tk.END)
@@ -135,8 +205,8 @@ def restart():
 
 def update_remaining():
     remaining_output.delete(1.0, tk.END)
-    remaining_output.insert(tk.END, f"Remaining: {len(candidates)}\n")
-    for word in candidates[:20]:
+    remaining_output.insert(tk.END, f"Remaining: {len(state.candidates)}\n")
+    for word in state.candidates[:20]:
         remaining_output.insert(tk.END, f"{word.upper()}\n")
 
 # Layout
@@ -167,16 +237,33 @@ for i in range(5):
 apply_button = tk.Button(root, text="Apply Feedback", command=apply)
 apply_button.grid(row=3, column=0, columnspan=5, pady=5)
 def check_apply_button(*args):
+    update_completions()
     filled = all(len(var.get()) == 1 and var.get().isalpha() for var in letter_vars)
     if not filled:
         apply_button.config(state="disabled")
         return
     word = ''.join(var.get().lower() for var in letter_vars)
-    if word in candidates:
+    if word in state.candidate_set:
         apply_button.config(state="normal")
     else:
         apply_button.config(state="disabled")
 
+def update_completions():
+    """List words matching the letters typed so far, consistent ones first."""
+    completions_output.delete(1.0, tk.END)
+    pattern = ''.join(var.get().lower() or '?' for var in letter_vars)
+    if pattern == "?????":
+        return
+    matches = get_word_trie().match(pattern)
+    consistent = state.consistent[matches]
+    shown = np.concatenate([matches[consistent], matches[~consistent]])[:MAX_COMPLETIONS]
+    words = get_word_trie().words
+    for i in shown:
+        label = "consistent" if state.consistent[i] else "inconsistent"
+        completions_output.insert(tk.END, f"{words[i].upper():<8} {label}\n")
+    if len(matches) > MAX_COMPLETIONS:
+        completions_output.insert(tk.END, f"... {len(matches) - MAX_COMPLETIONS} more\n")
+
 for var in letter_vars:
     var.trace_add("write", check_apply_button)
 apply_button.config(state="disabled")
@@ -193,11 +280,17 @@ tk.Label(root, text="Remaining Candidates:").grid(row=8, column=0, sticky="w")
 remaining_output = tk.Text(root, width=70, height=10)
 remaining_output.grid(row=9, column=0, columnspan=5)
 
+tk.Label(root, text="Completions:").grid(row=11, column=0, sticky="w")
+completions_output = tk.Text(root, width=70, height=6)
+completions_output.grid(row=12, column=0, columnspan=5)
+
 # Configure additional columns for proper right alignment of bottom controls
 for c in range(5):
     root.columnconfigure(c, weight=1)
 
-# Place Restart button at bottom right
+# Place Undo/Redo and Restart buttons at bottom right
+tk.Button(root, text="Undo", command=undo).grid(row=10, column=2, sticky="e", pady=(10, 5))
+tk.Button(root, text="Redo", command=redo).grid(row=10, column=3, sticky="e", pady=(10, 5))
 tk.Button(root, text="Restart", command=restart).grid(row=10, column=4, sticky="e", padx=10, pady=(10, 5))
 
 def set_current_pos(idx):
@@ -268,4 +361,15 @@ def launch():
 update_cursor_highlight()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=f"Wordle Solver v{__version__}")
+    parser.add_argument("--time-budget-ms", type=float, default=None,
+                        help="Show the best suggestions found within this many milliseconds")
+    parser.add_argument("--max-evaluations", type=int, default=None,
+                        help="Score at most this many guesses (most promising first)")
+    args = parser.parse_args()
+    if args.max_evaluations is not None and args.max_evaluations < 1:
+        parser.error("--max-evaluations needs a value of at least 1")
+    if args.time_budget_ms is not None:
+        time_budget = args.time_budget_ms / 1000
+    max_evaluations = args.max_evaluations
     launch()
\ No newline at end of file
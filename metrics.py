@@ -0,0 +1,99 @@
+# metrics.py
+import functools
+import json
+import re
+import time
+
+PROMETHEUS_PREFIX = "wordle_"
+
+
+class Metrics:
+    """Process-wide counters and timers for the solver's hot paths.
+
+    Disabled by default; instrumented code then pays a single attribute check per call.
+    Timers keep count, total and max seconds per name.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.counters = {}
+        self.timers = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.counters.clear()
+        self.timers.clear()
+
+    def incr(self, name, value=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, seconds):
+        if self.enabled:
+            timer = self.timers.setdefault(name, [0, 0.0, 0.0])
+            timer[0] += 1
+            timer[1] += seconds
+            timer[2] = max(timer[2], seconds)
+
+    def snapshot(self):
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "timers": {
+                name: {"count": count, "total_s": total, "mean_s": total / count, "max_s": peak}
+                for name, (count, total, peak) in sorted(self.timers.items())
+            },
+        }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        """Prometheus text exposition: counters as *_total, timers as *_seconds summaries."""
+        lines = []
+        for name, value in sorted(self.counters.items()):
+            metric = _prometheus_name(name) + "_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, (count, total, peak) in sorted(self.timers.items()):
+            metric = _prometheus_name(name) + "_seconds"
+            lines += [
+                f"# TYPE {metric} summary",
+                f"{metric}_count {count}",
+                f"{metric}_sum {total:.9f}",
+                f"# TYPE {metric}_max gauge",
+                f"{metric}_max {peak:.9f}",
+            ]
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write to path, as Prometheus text for .prom/.txt files and JSON otherwise."""
+        text = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json()
+        with open(path, 'w') as f:
+            f.write(text)
+
+
+def _prometheus_name(name):
+    return PROMETHEUS_PREFIX + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+metrics = Metrics()
+
+
+def timed(name):
+    """Decorator recording each call's wall time under name while metrics are enabled."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics.observe(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
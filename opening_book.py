@@ -0,0 +1,125 @@
+# opening_book.py
+import hashlib
+import os
+import struct
+import numpy as np
+from feedback import update_constraints
+from patterns import NUM_PATTERNS, decode_pattern, encode_feedback
+from solver import SCORING_VERSION, filter_candidates, rank_suggestions
+from wordlist import get_frequencies, load_wordle_list, word_list_hash
+
+BOOK_FILENAME = "opening_book.bin"
+BOOK_MAGIC = b"WOBK"
+BOOK_VERSION = 1
+# magic, format version, record count, sha256 of word list + frequencies + scoring version
+_HEADER = struct.Struct("<4sII32s")
+HEADER_SIZE = 64
+# First-turn suggestions are stored under this opener/pattern pair
+NO_GUESS = 0xFFFF
+NO_PATTERN = 0xFF
+RECORD = np.dtype([
+    ('opener', '<u2'), ('pattern', 'u1'), ('rank', 'u1'), ('word', '<u2'),
+    ('score', '<f8'), ('entropy', '<f8'), ('frequency', '<f8'),
+])
+
+_default_book = None
+
+
+def book_key(words):
+    """Fingerprint of everything the stored rankings depend on."""
+    h = hashlib.sha256(word_list_hash(words))
+    h.update(get_frequencies().tobytes())
+    h.update(struct.pack("<I", SCORING_VERSION))
+    return h.digest()
+
+
+class OpeningBook:
+    """Precomputed first-turn suggestions and second-turn suggestions per opener pattern."""
+
+    def __init__(self, words, records):
+        self.words = words
+        self.openers = set()
+        self.entries = {}
+        for r in records:
+            key = (int(r['opener']), int(r['pattern']))
+            self.entries.setdefault(key, []).append(
+                (words[r['word']], float(r['score']), float(r['entropy']), float(r['frequency']))
+            )
+            if key[0] != NO_GUESS:
+                self.openers.add(words[key[0]])
+        self._index = {w: i for i, w in enumerate(words)}
+
+    def first(self):
+        return self.entries.get((NO_GUESS, NO_PATTERN), [])
+
+    def second(self, guess, feedback):
+        """Suggestions after one guess, or None if the book does not cover it."""
+        if guess not in self.openers:
+            return None
+        code = encode_feedback(feedback)
+        if code < 0:
+            return None
+        # Every pattern is computed for a covered opener; absent means no candidates
+        return self.entries.get((self._index[guess], code), [])
+
+
+def build_opening_book(words, path, openers=5):
+    """Rank the first turn, then every pattern of the top `openers` first guesses."""
+    first = rank_suggestions(words, {}, {}, set())
+    index = {w: i for i, w in enumerate(words)}
+    rows = [(NO_GUESS, NO_PATTERN, rank, index[w], s, e, f) for rank, (w, s, e, f) in enumerate(first)]
+    for opener, *_ in first[:openers]:
+        for code in range(NUM_PATTERNS):
+            feedback = decode_pattern(code)
+            greens = {}
+            yellows = {}
+            grays = set()
+            update_constraints(opener, feedback, greens, yellows, grays)
+            candidates = filter_candidates(words, opener, feedback, greens, yellows, grays)
+            for rank, (w, s, e, f) in enumerate(rank_suggestions(candidates, greens, yellows, grays)):
+                rows.append((index[opener], code, rank, index[w], s, e, f))
+    records = np.array(rows, dtype=RECORD)
+    header = _HEADER.pack(BOOK_MAGIC, BOOK_VERSION, len(records), book_key(words))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header.ljust(HEADER_SIZE, b'\0'))
+        f.write(records.tobytes())
+    os.replace(tmp_path, path)
+    return OpeningBook(words, records)
+
+
+def load_opening_book(words, path):
+    """Read the book at path, or None if it is missing or stale. Never builds."""
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except OSError:
+        return None
+    if len(raw) < HEADER_SIZE:
+        return None
+    magic, version, count, key = _HEADER.unpack_from(raw)
+    if (magic, version) != (BOOK_MAGIC, BOOK_VERSION) or len(raw) != HEADER_SIZE + count * RECORD.itemsize:
+        return None
+    if key != book_key(words):
+        return None
+    return OpeningBook(words, np.frombuffer(raw, dtype=RECORD, offset=HEADER_SIZE))
+
+
+def _book_path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), BOOK_FILENAME)
+
+
+def get_opening_book():
+    """Book for the default word list, or None when it has not been generated."""
+    global _default_book
+    if _default_book is None:
+        _default_book = load_opening_book(load_wordle_list(), _book_path())
+    return _default_book
+
+
+if __name__ == "__main__":
+    import time
+    start = time.perf_counter()
+    book = build_opening_book(load_wordle_list(), _book_path())
+    print(f"Opening book written to {_book_path()} ({len(book.entries)} states, "
+          f"{time.perf_counter() - start:.1f}s)")
@@ -0,0 +1,110 @@
+# parallel.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from patterns import HEADER_SIZE
+
+DEFAULT_CHUNK_SIZE = 512
+
+_pool = None
+_pool_workers = 0
+# Per-process cache of the memory-mapped pattern matrix, opened once per worker
+_worker_matrices = {}
+
+
+def _share(array):
+    """Copy array into a new shared memory block; returns (block, descriptor)."""
+    shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+
+def _attach(descriptor):
+    name, shape, dtype = descriptor
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _open_matrix(path, n):
+    key = (path, n)
+    if key not in _worker_matrices:
+        _worker_matrices[key] = np.memmap(path, dtype=np.uint8, mode='r', offset=HEADER_SIZE, shape=(n, n))
+    return _worker_matrices[key]
+
+
+def _score_chunk(task):
+    from solver import batch_entropy
+    start, stop, k, idx_desc, sol_desc, freq_desc, matrix_src = task
+    blocks = []
+    try:
+        shm, idx = _attach(idx_desc)
+        blocks.append(shm)
+        shm, solutions = _attach(sol_desc)
+        blocks.append(shm)
+        shm, freqs = _attach(freq_desc)
+        blocks.append(shm)
+        if matrix_src[0] == 'file':
+            matrix = _open_matrix(*matrix_src[1:])
+        else:
+            shm, matrix = _attach(matrix_src[1])
+            blocks.append(shm)
+        entropies = batch_entropy(idx[start:stop], solutions, matrix)
+        scores = entropies * freqs[start:stop]
+        top = np.argsort(-scores, kind='stable')[:k]
+        return start + top, scores[top], entropies[top]
+    finally:
+        # Views must be dropped before the blocks can close
+        idx = solutions = freqs = matrix = None
+        for shm in blocks:
+            shm.close()
+
+
+def _get_pool(workers):
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+    return _pool
+
+
+def parallel_top_k(idx, frequencies, matrix, k=5, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, solutions=None):
+    """Score every row of idx against solutions (default idx) across a process pool and merge top-k.
+
+    matrix is either the default PatternMatrix (workers memory-map its file) or an
+    ad hoc ndarray, which is placed in shared memory. Returns positions into idx,
+    scores and entropies in the same order a serial stable sort would give.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+    shared = []
+    try:
+        shm, idx_desc = _share(np.ascontiguousarray(idx, dtype=np.intp))
+        shared.append(shm)
+        shm, sol_desc = _share(np.ascontiguousarray(idx if solutions is None else solutions, dtype=np.intp))
+        shared.append(shm)
+        shm, freq_desc = _share(np.ascontiguousarray(frequencies, dtype=np.float64))
+        shared.append(shm)
+        if isinstance(matrix, np.memmap) and matrix.filename:
+            matrix_src = ('file', matrix.filename, matrix.shape[0])
+        else:
+            shm, matrix_desc = _share(np.ascontiguousarray(matrix))
+            shared.append(shm)
+            matrix_src = ('shm', matrix_desc)
+        tasks = [
+            (start, min(start + chunk_size, len(idx)), k, idx_desc, sol_desc, freq_desc, matrix_src)
+            for start in range(0, len(idx), chunk_size)
+        ]
+        results = list(_get_pool(workers).map(_score_chunk, tasks))
+    finally:
+        for shm in shared:
+            shm.close()
+            shm.unlink()
+    positions = np.concatenate([r[0] for r in results])
+    scores = np.concatenate([r[1] for r in results])
+    entropies = np.concatenate([r[2] for r in results])
+    # Descending score, ties by original position: identical to the serial stable sort
+    from solver import _merge_top
+    return _merge_top(positions, scores, entropies, k)
@@ -0,0 +1,148 @@
+# patterns.py
+import os
+import struct
+import numpy as np
+from metrics import timed
+from wordlist import app_data_dir, load_word_array, load_wordle_list, word_list_hash, words_to_array
+
+# Feedback is stored as a base-3 integer, first letter most significant:
+# B=0, Y=1, G=2, so "BBBBB" -> 0 and "GGGGG" -> 242. Fits in a uint8 cell.
+NUM_PATTERNS = 243
+ALL_GREEN = NUM_PATTERNS - 1
+_DIGITS = {'B': 0, 'Y': 1, 'G': 2}
+_LETTERS = 'BYG'
+
+MATRIX_FILENAME = "pattern_matrix.bin"
+MATRIX_MAGIC = b"WPMX"
+MATRIX_VERSION = 1
+# magic, format version, word count, sha256 of the word list; padded to 64 bytes
+_HEADER = struct.Struct("<4sII32s")
+HEADER_SIZE = 64
+BUILD_CHUNK = 256
+
+_default_matrix = None
+
+
+def encode_feedback(feedback):
+    """Base-3 code for a feedback string, or -1 if it is not a valid pattern."""
+    if len(feedback) != 5 or any(fb not in _DIGITS for fb in feedback):
+        return -1
+    code = 0
+    for fb in feedback:
+        code = code * 3 + _DIGITS[fb]
+    return code
+
+
+def decode_pattern(code):
+    code = int(code)
+    letters = []
+    for _ in range(5):
+        code, digit = divmod(code, 3)
+        letters.append(_LETTERS[digit])
+    return ''.join(reversed(letters))
+
+
+def compute_patterns(guesses, solutions):
+    """Pattern codes for every (guess, solution) pair of two N x 5 letter arrays."""
+    counts = np.zeros((len(solutions), 26), dtype=np.uint8)
+    np.add.at(counts, (np.arange(len(solutions))[:, None], solutions - 97), 1)
+    green = [guesses[:, i, None] == solutions[None, :, i] for i in range(5)]
+    codes = np.zeros((len(guesses), len(solutions)), dtype=np.uint8)
+    for i in range(5):
+        # A yellow needs a copy of the letter in the solution that is not already
+        # claimed by a green or by an earlier copy of the same letter in the guess.
+        available = counts.T[guesses[:, i] - 97]
+        claimed = np.zeros_like(codes)
+        for k in range(5):
+            if k == i:
+                continue
+            rows = np.flatnonzero(guesses[:, k] == guesses[:, i])
+            if len(rows) == 0:
+                continue
+            claimed[rows] += 1 if k < i else green[k][rows]
+        yellow = (available > claimed) & ~green[i]
+        codes = codes * 3 + (green[i] * np.uint8(2) | yellow)
+    return codes
+
+
+class PatternMatrix:
+    """Memory-mapped guess x solution pattern codes for a fixed word list."""
+
+    def __init__(self, words, matrix):
+        self.words = words
+        self.index = {w: i for i, w in enumerate(words)}
+        self.matrix = matrix
+
+    def __len__(self):
+        return len(self.words)
+
+    def indices(self, words):
+        """Row indices for words, or None if any word is outside the matrix."""
+        if words is self.words:
+            return np.arange(len(words))
+        try:
+            return np.fromiter((self.index[w] for w in words), dtype=np.intp, count=len(words))
+        except KeyError:
+            return None
+
+    def code(self, guess, solution):
+        return int(self.matrix[self.index[guess], self.index[solution]])
+
+
+def _read_header(path):
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read(HEADER_SIZE)
+    except OSError:
+        return None
+    if len(raw) != HEADER_SIZE:
+        return None
+    return _HEADER.unpack_from(raw)
+
+
+@timed("build_pattern_matrix")
+def build_pattern_matrix(words, path, letters=None):
+    if letters is None:
+        letters = words_to_array(words)
+    n = len(words)
+    header = _HEADER.pack(MATRIX_MAGIC, MATRIX_VERSION, n, word_list_hash(words))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header.ljust(HEADER_SIZE, b'\0'))
+    out = np.memmap(tmp_path, dtype=np.uint8, mode='r+', offset=HEADER_SIZE, shape=(n, n))
+    for start in range(0, n, BUILD_CHUNK):
+        out[start:start + BUILD_CHUNK] = compute_patterns(letters[start:start + BUILD_CHUNK], letters)
+    out.flush()
+    del out
+    # Atomic swap so concurrent readers never see a half-written matrix
+    os.replace(tmp_path, path)
+
+
+@timed("load_pattern_matrix")
+def load_pattern_matrix(words, path, letters=None):
+    """Open the matrix for words at path, rebuilding it if missing or stale."""
+    expected = (MATRIX_MAGIC, MATRIX_VERSION, len(words), word_list_hash(words))
+    if _read_header(path) != expected:
+        build_pattern_matrix(words, path, letters)
+    n = len(words)
+    matrix = np.memmap(path, dtype=np.uint8, mode='r', offset=HEADER_SIZE, shape=(n, n))
+    return PatternMatrix(words, matrix)
+
+
+def get_pattern_matrix():
+    """Lazily open the matrix for the default word list; nothing is built at import."""
+    global _default_matrix
+    if _default_matrix is None:
+        path = os.path.join(app_data_dir(), MATRIX_FILENAME)
+        _default_matrix = load_pattern_matrix(load_wordle_list(), path, load_word_array())
+    return _default_matrix
+
+
+def pattern_block(guesses, solutions):
+    """Pattern codes for guesses x solutions, read from the matrix when possible."""
+    pm = get_pattern_matrix()
+    g_idx = pm.indices(guesses)
+    s_idx = pm.indices(solutions)
+    if g_idx is not None and s_idx is not None:
+        return pm.matrix[np.ix_(g_idx, s_idx)]
+    return compute_patterns(words_to_array(guesses), words_to_array(solutions))
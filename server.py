@@ -0,0 +1,295 @@
+# server.py
+"""Resident HTTP/JSON solver service on asyncio, plus a load generator for it.
+
+    python server.py serve --port 8765
+    curl -d '{"history": [["crane", "BYGBY"]]}' http://127.0.0.1:8765/suggest
+    python server.py load --port 8765 --requests 2000 --concurrency 32 --states 50
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from cli import _parse_history, format_result, solve
+from constraints import get_constraint_index
+from decision_tree import get_decision_tree
+from feedback import get_feedback
+from opening_book import get_opening_book
+from patterns import get_pattern_matrix
+from wordlist import get_frequencies, load_wordle_list
+from version import __version__
+
+DEFAULT_PORT = 8765
+# Requests arriving within this window are dispatched together
+BATCH_WINDOW_S = 0.002
+MAX_BODY = 1 << 20
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+def canonical_state(history):
+    """Order- and repeat-independent key for a history.
+
+    Candidates and constraints after a set of (guess, feedback) pairs are the
+    intersection of what each pair allows, so two histories with the same pairs
+    reach the same state and can share one ranking.
+    """
+    return tuple(sorted(set(history)))
+
+
+class SolverService:
+    """Warm solver state plus micro-batching of suggestion requests.
+
+    Requests are queued; a batcher waits BATCH_WINDOW_S after the first one, groups
+    the queue by canonical state and scores each distinct state once on a thread
+    pool, so the event loop never runs a ranking. A request for a state that is
+    already being scored waits on that result instead of queueing again. The state is
+    solved by replaying the first history that reached it, in its original order.
+    """
+
+    def __init__(self, words=None, threads=1, batch_window=BATCH_WINDOW_S, **solve_options):
+        self.words = words if words is not None else load_wordle_list()
+        self.batch_window = batch_window
+        self.solve_options = solve_options
+        self._executor = ThreadPoolExecutor(max_workers=threads)
+        self._queue = None
+        self._inflight = {}
+        # canonical state -> first history seen for it, until its batch is dispatched
+        self._histories = {}
+        self._batcher = None
+        self.stats = {"requests": 0, "batches": 0, "rankings": 0, "coalesced": 0}
+
+    def warm(self):
+        """Load everything a first request would otherwise pay for."""
+        get_pattern_matrix()
+        get_frequencies()
+        get_constraint_index()
+        get_opening_book()
+        get_decision_tree()
+        return self
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._run_batches())
+
+    async def close(self):
+        if self._batcher is not None:
+            self._batcher.cancel()
+        self._executor.shutdown(wait=False)
+
+    async def suggest(self, history):
+        self.stats["requests"] += 1
+        key = canonical_state(history)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[key] = future
+            self._histories[key] = list(history)
+            await self._queue.put(key)
+        else:
+            self.stats["coalesced"] += 1
+        # shield: one cancelled client must not cancel the ranking others are waiting on
+        return await asyncio.shield(future)
+
+    def _solve_all(self, histories):
+        results = {}
+        for key, history in histories.items():
+            # Per state, so one malformed request cannot fail the rest of its batch
+            try:
+                results[key] = format_result(*solve(self.words, history, **self.solve_options))
+            except Exception as e:
+                results[key] = {"error": str(e)}
+        return results
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            keys = [await self._queue.get()]
+            await asyncio.sleep(self.batch_window)
+            while not self._queue.empty():
+                keys.append(self._queue.get_nowait())
+            self.stats["batches"] += 1
+            self.stats["rankings"] += len(keys)
+            histories = {key: self._histories.pop(key) for key in keys}
+            try:
+                results = await loop.run_in_executor(self._executor, self._solve_all, histories)
+            except Exception as e:
+                results = {key: {"error": str(e)} for key in keys}
+            for key in keys:
+                future = self._inflight.pop(key)
+                if not future.done():
+                    future.set_result(results[key])
+
+    async def handle(self, method, path, body):
+        """Route one request; returns (status, JSON-ready payload)."""
+        if path == "/health":
+            return 200, {"status": "ok", "version": __version__}
+        if path == "/stats":
+            return 200, dict(self.stats, inflight=len(self._inflight))
+        if path != "/suggest":
+            return 404, {"error": f"unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        try:
+            record = json.loads(body or b"{}")
+            history = _parse_history(record)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            return 400, {"error": str(e)}
+        result = await self.suggest(history)
+        if "id" in record:
+            result = dict(result, id=record["id"])
+        return (400 if "error" in result else 200), result
+
+    async def serve_connection(self, reader, writer):
+        """HTTP/1.1 with keep-alive: just enough for JSON clients and the load generator."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode('latin-1').split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode('latin-1').partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    status, payload = 413, {"error": "request body too large"}
+                    body = None
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.handle(method, path, body)
+                data = json.dumps(payload).encode()
+                keep_alive = body is not None and headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(service, host="127.0.0.1", port=DEFAULT_PORT):
+    await service.start()
+    server = await asyncio.start_server(service.serve_connection, host, port)
+    print(f"Wordle solver service v{__version__} on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+async def _post(reader, writer, path, payload):
+    data = json.dumps(payload).encode()
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: solver\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode('latin-1').partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+def sample_histories(words, states, seed=0):
+    """states distinct one-guess histories from random openers and answers."""
+    rng = random.Random(seed)
+    histories = set()
+    while len(histories) < states:
+        guess, answer = rng.choice(words), rng.choice(words)
+        histories.add(((guess, get_feedback(guess, answer)),))
+    return [list(h) for h in sorted(histories)]
+
+
+async def run_load(host, port, histories, requests=1000, concurrency=16, seed=0):
+    """Fire requests over concurrency keep-alive connections; returns throughput and latency."""
+    rng = random.Random(seed)
+    plan = [rng.choice(histories) for _ in range(requests)]
+    latencies = []
+    errors = 0
+
+    async def client(slice_):
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for history in slice_:
+                start = time.perf_counter()
+                status, _ = await _post(reader, writer, "/suggest", {"history": history})
+                latencies.append(time.perf_counter() - start)
+                errors += status != 200
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(plan[i::concurrency]) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    ms = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "concurrency": concurrency,
+        "distinct_states": len(histories),
+        "elapsed_s": elapsed,
+        "requests_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "max_ms": float(ms.max()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=f"Wordle solver service v{__version__}")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_parser = sub.add_parser("serve", help="Run the HTTP/JSON service")
+    serve_parser.add_argument("--threads", type=int, default=1, help="Scoring threads (default 1)")
+    serve_parser.add_argument("--batch-window-ms", type=float, default=BATCH_WINDOW_S * 1000)
+    serve_parser.add_argument("--workers", type=int, default=1, help="Processes per ranking (default 1)")
+    serve_parser.add_argument("--time-budget-ms", type=float, default=None)
+    load_parser = sub.add_parser("load", help="Load-test a running service")
+    load_parser.add_argument("--requests", type=int, default=1000)
+    load_parser.add_argument("--concurrency", type=int, default=16)
+    load_parser.add_argument("--states", type=int, default=50, help="Distinct game states to draw from")
+    load_parser.add_argument("--seed", type=int, default=0)
+    for p in (serve_parser, load_parser):
+        p.add_argument("--host", default="127.0.0.1")
+        p.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        time_budget = args.time_budget_ms / 1000 if args.time_budget_ms is not None else None
+        service = SolverService(threads=args.threads, batch_window=args.batch_window_ms / 1000,
+                                workers=args.workers, time_budget=time_budget).warm()
+        try:
+            asyncio.run(serve(service, args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    histories = sample_histories(load_wordle_list(), args.states, args.seed)
+    result = asyncio.run(run_load(args.host, args.port, histories, args.requests, args.concurrency, args.seed))
+    print(f"{result['requests']} requests ({result['errors']} errors) over {result['concurrency']} connections, "
+          f"{result['distinct_states']} distinct states")
+    print(f"Throughput: {result['requests_per_sec']:.1f} req/s | p50 {result['p50_ms']:.2f} ms | "
+          f"p99 {result['p99_ms']:.2f} ms | max {result['max_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,534 @@
 # solver.py
+import hashlib
 import math
+import time
+from collections import namedtuple
 import numpy as np
-from functools import lru_cache
-from feedback import get_feedback, matches_feedback, enforce_hard_mode
-from wordlist import get_frequency
+from constraints import get_constraint_index
+from metrics import metrics, timed
+from feedback import enforce_hard_mode, feedback_codes
+from patterns import (
+    ALL_GREEN, NUM_PATTERNS, compute_patterns, encode_feedback, get_pattern_matrix, pattern_block, words_to_array,
+)
+from wordlist import get_frequencies, get_frequency
 
-@lru_cache(maxsize=1024)
-def cached_feedback(guess, solution):
-    return get_feedback(guess, solution)
+# Bump whenever rank_suggestions scoring changes; persisted rankings keyed on it
+# (e.g. the opening book) are then treated as stale.
+SCORING_VERSION = 1
 
+# One step of anytime ranking; complete means top5 is final
+RankingSnapshot = namedtuple("RankingSnapshot", ["top5", "evaluated", "total", "complete"])
+
+# Result of sampled ranking; rescored counts guesses scored exactly
+SampledRanking = namedtuple("SampledRanking", ["top5", "rescored", "total"])
+
+# Result of two-step lookahead ranking. expanded guesses were scored with lookahead,
+# pruned ones were cut by top-K or the bound; partitions_avoided counts next-turn
+# buckets answered by the cache, a closed form or pruning instead of scoring.
+LookaheadRanking = namedtuple(
+    "LookaheadRanking", ["top5", "expanded", "pruned", "partitions_scored", "partitions_avoided"]
+)
+
+MULTI_BOARD_OBJECTIVES = ("entropy", "solve")
+
+# Ranking with partition dedup: of the guesses scored, trivial ones split the
+# candidates into a single bucket; the rest collapsed into classes distinct partitions.
+PartitionedRanking = namedtuple("PartitionedRanking", ["top5", "guesses", "classes", "trivial"])
+
+# Upper bound on guess x candidate cells materialized per chunk (~4 MB of codes
+# plus the int64 histogram input), so peak memory stays flat on the full list.
+CHUNK_CELLS = 1 << 22
+
+def _pattern_counts(codes):
+    """Histogram of each row of a (guesses x candidates) block over the 243 patterns."""
+    rows = codes.shape[0]
+    # Offset each row into its own 243-bin slice so one bincount covers the block
+    offsets = np.arange(rows, dtype=np.intp)[:, None] * NUM_PATTERNS
+    counts = np.bincount((codes + offsets).ravel(), minlength=rows * NUM_PATTERNS)
+    return counts.reshape(rows, NUM_PATTERNS).astype(np.float64)
+
+def _entropies(codes):
+    """Entropy of each row of a (guesses x candidates) block of pattern codes."""
+    rows, n = codes.shape
+    if n == 0:
+        return np.zeros(rows)
+    counts = _pattern_counts(codes)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        plogp = np.where(counts > 0, counts * np.log2(counts), 0.0)
+    return math.log2(n) - plogp.sum(axis=1) / n
+
+def _sampled_entropies(codes, z):
+    """Entropy estimate and confidence half-width per row from sampled candidate columns.
+
+    Uses the Miller-Madow bias correction and the delta-method variance of the plug-in
+    estimator; the bias term is also added to the half-width to stay conservative.
+    """
+    m = codes.shape[1]
+    counts = _pattern_counts(codes)
+    probs = counts / m
+    with np.errstate(divide='ignore', invalid='ignore'):
+        logp = np.where(counts > 0, np.log2(probs), 0.0)
+    plugin = -(probs * logp).sum(axis=1)
+    variance = np.maximum((probs * logp ** 2).sum(axis=1) - plugin ** 2, 0.0) / m
+    bias = ((counts > 0).sum(axis=1) - 1) / (2 * m * math.log(2))
+    return plugin + bias, z * np.sqrt(variance) + bias
+
+def _row_blocks(guess_indices, candidate_indices, matrix, chunk_cells=CHUNK_CELLS):
+    """Yield (offset, codes) blocks of guess rows x candidate columns, bounded in size."""
+    guess_indices = np.asarray(guess_indices, dtype=np.intp)
+    candidate_indices = np.asarray(candidate_indices, dtype=np.intp)
+    chunk = max(1, chunk_cells // max(1, len(candidate_indices)))
+    for start in range(0, len(guess_indices), chunk):
+        rows = guess_indices[start:start + chunk]
+        yield start, matrix[np.ix_(rows, candidate_indices)]
+
+def batch_entropy(guess_indices, candidate_indices, matrix=None, chunk_cells=CHUNK_CELLS):
+    """Entropy of every guess row against the candidate columns of a pattern matrix."""
+    if matrix is None:
+        matrix = get_pattern_matrix().matrix
+    out = np.empty(len(guess_indices))
+    for start, block in _row_blocks(guess_indices, candidate_indices, matrix, chunk_cells):
+        out[start:start + len(block)] = _entropies(block)
+    return out
+
+def _pattern_source(words):
+    """Pattern matrix and row indices for words, falling back to an ad hoc matrix."""
+    pm = get_pattern_matrix()
+    idx = pm.indices(words)
+    if idx is not None:
+        return pm.matrix, idx
+    arr = words_to_array(words)
+    return compute_patterns(arr, arr), np.arange(len(words))
+
+@timed("hard_mode_mask")
+def _hard_mode_mask(words, idx, greens, yellows, grays):
+    """Hard-mode mask for words; idx are their rows in the default word list, if known."""
+    if idx is not None:
+        return get_constraint_index().mask(greens, yellows, grays)[idx]
+    return np.fromiter(
+        (enforce_hard_mode(w, greens, yellows, grays) for w in words), dtype=bool, count=len(words)
+    )
+
+@timed("calculate_entropy")
 def calculate_entropy(guess, possible_solutions):
-    patterns = [cached_feedback(guess, sol) for sol in possible_solutions]
-    unique, counts = np.unique(patterns, return_counts=True)
-    probs = counts / len(possible_solutions)
-    entropy = -np.sum(probs * np.log2(probs))
-    return float(entropy)
+    return float(_entropies(pattern_block([guess], possible_solutions))[0])
 
-def rank_suggestions(candidates, greens, yellows, grays):
+def _scoring_inputs(candidates, greens, yellows, grays):
+    """Hard-mode survivors plus the matrix, row indices and frequencies to score them."""
     # Single pass constraint check; avoids duplicated gray filtering logic
-    valid = [w for w in candidates if enforce_hard_mode(w, greens, yellows, grays)]
-    scored = []
-    for word in valid:
-        entropy = calculate_entropy(word, valid)
-        frequency = get_frequency(word)
-        score = entropy * frequency
-        scored.append((word, score, entropy, frequency))
-    scored.sort(key=lambda x: x[1], reverse=True)
-    return scored[:5]
+    pm = get_pattern_matrix()
+    cand_idx = pm.indices(candidates)
+    keep = _hard_mode_mask(candidates, cand_idx, greens, yellows, grays)
+    valid = [w for w, k in zip(candidates, keep) if k]
+    if not valid:
+        return valid, None, None, None
+    if cand_idx is not None:
+        idx = cand_idx[keep]
+        matrix = pm.matrix
+        frequencies = get_frequencies()[idx].astype(np.float64)
+    else:
+        matrix, idx = _pattern_source(valid)
+        frequencies = np.array([get_frequency(w) for w in valid])
+    return valid, matrix, idx, frequencies
 
-def filter_candidates(candidates, guess, feedback, greens, yellows, grays):
+def _pool_inputs(guesses, candidates, greens, yellows, grays):
+    """_scoring_inputs with separate pools: hard-mode guesses scored against candidate solutions.
+
+    Returns valid guesses, matrix, their rows, the solution rows (columns) and guess
+    frequencies. With two or fewer solutions left only they are worth guessing.
+    """
+    solutions, matrix, sol_idx, _ = _scoring_inputs(candidates, greens, yellows, grays)
+    if not solutions:
+        return solutions, None, None, None, None
+    if len(solutions) <= 2:
+        guesses = solutions
+    pm = get_pattern_matrix()
+    guess_idx = pm.indices(guesses)
+    keep = _hard_mode_mask(guesses, guess_idx, greens, yellows, grays)
+    valid = [w for w, k in zip(guesses, keep) if k]
+    if not valid:
+        return valid, None, None, None, None
+    if guess_idx is not None and matrix is pm.matrix:
+        guess_idx = guess_idx[keep]
+        frequencies = get_frequencies()[guess_idx].astype(np.float64)
+    else:
+        matrix = compute_patterns(words_to_array(valid), words_to_array(solutions))
+        guess_idx, sol_idx = np.arange(len(valid)), np.arange(len(solutions))
+        frequencies = np.array([get_frequency(w) for w in valid])
+    return valid, matrix, guess_idx, sol_idx, frequencies
+
+def _ranking_inputs(candidates, greens, yellows, grays, guesses=None):
+    """valid, matrix, guess rows, solution rows (None: same as guesses) and frequencies."""
+    if guesses is None:
+        valid, matrix, idx, frequencies = _scoring_inputs(candidates, greens, yellows, grays)
+        return valid, matrix, idx, None, frequencies
+    return _pool_inputs(guesses, candidates, greens, yellows, grays)
+
+def _merge_top(positions, scores, entropies, k=5):
+    """Top k by descending score, ties by position: the order of a stable sort."""
+    order = np.lexsort((positions, -scores))[:k]
+    return positions[order], scores[order], entropies[order]
+
+@timed("rank_suggestions")
+def rank_suggestions(candidates, greens, yellows, grays, workers=1, chunk_size=None, guesses=None):
+    """Top 5 (word, score, entropy, frequency) guesses; workers > 1 scores across processes.
+
+    By default the candidates are both the possible solutions and the guesses; passing
+    guesses (e.g. the full word list when candidates come from an answer pool) scores
+    those instead, against the candidates.
+    """
+    metrics.incr("rank_suggestions_candidates", len(candidates))
+    if not workers or workers <= 1:
+        # Run the anytime ranking to completion; it stops as soon as the top 5 is provably final
+        for snapshot in iter_rank_suggestions(candidates, greens, yellows, grays, guesses=guesses):
+            pass
+        return snapshot.top5
+    valid, matrix, idx, solutions, frequencies = _ranking_inputs(candidates, greens, yellows, grays, guesses)
+    if not valid:
+        return []
+    from parallel import parallel_top_k
+    top, scores, entropies = parallel_top_k(idx, frequencies, matrix, 5, workers, chunk_size, solutions)
+    return [
+        (valid[i], float(s), float(e), float(frequencies[i]))
+        for i, s, e in zip(top, scores, entropies)
+    ]
+
+def iter_rank_suggestions(candidates, greens, yellows, grays, chunk_size=256, deadline=None, max_evaluations=None,
+                          k=5, guesses=None):
+    """Anytime ranking: yields a RankingSnapshot after each chunk of guesses is scored.
+
+    Guesses are visited by descending frequency. Entropy is at most log2(min(n, 243)),
+    so that is also descending order of the best score a guess could reach; once that
+    bound drops below the 5th best score the snapshot is marked complete and equals
+    rank_suggestions(). deadline (a time.perf_counter() value) and max_evaluations
+    stop early with the best top 5 found so far. k widens the list kept (and the
+    point at which it is provably final) beyond 5. guesses is as for rank_suggestions().
+    """
+    valid, matrix, idx, solutions, frequencies = _ranking_inputs(candidates, greens, yellows, grays, guesses)
+    if not valid:
+        yield RankingSnapshot([], 0, 0, True)
+        return
+    for positions, scores, entropies, evaluated, complete in _anytime_top(
+        matrix, idx, frequencies, k, chunk_size, max_evaluations, solutions=solutions
+    ):
+        top5 = [
+            (valid[i], float(s), float(e), float(frequencies[i]))
+            for i, s, e in zip(positions, scores, entropies)
+        ]
+        yield RankingSnapshot(top5, evaluated, len(valid), complete)
+        if deadline is not None and time.perf_counter() >= deadline:
+            return
+
+def _canonical_partitions(codes):
+    """Relabel each row's buckets 0, 1, 2, ... in order of first appearance.
+
+    Two guesses that split the candidates into the same buckets then have identical
+    rows, whatever feedback labels the buckets carry.
+    """
+    rows, n = codes.shape
+    order = np.argsort(codes, axis=1, kind='stable')
+    ordered = np.take_along_axis(codes, order, axis=1)
+    starts = np.ones((rows, n), dtype=bool)
+    starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    # Stable sort: each bucket's first sorted slot holds its first column
+    last_start = np.maximum.accumulate(np.where(starts, np.arange(n), 0), axis=1)
+    first_col = np.take_along_axis(order, last_start, axis=1)
+    is_first = np.zeros((rows, n), dtype=bool)
+    np.put_along_axis(is_first, np.where(starts, order, order[:, :1]), True, axis=1)
+    rank = np.cumsum(is_first, axis=1) - 1
+    labels = np.empty_like(codes)
+    np.put_along_axis(labels, order, np.take_along_axis(rank, first_col, axis=1).astype(codes.dtype), axis=1)
+    return labels
+
+def _partition_entropies(guess_indices, candidate_indices, matrix, partitions):
+    """batch_entropy, computing entropy once per distinct partition of the candidates.
+
+    partitions maps a digest of a guess's canonical bucket labels to its entropy and
+    persists across calls; its "trivial" entry counts guesses skipped because every
+    candidate gave the same pattern (one bucket, entropy 0).
+    """
+    out = np.zeros(len(guess_indices))
+    for start, block in _row_blocks(guess_indices, candidate_indices, matrix):
+        trivial = (block == block[:, :1]).all(axis=1)
+        partitions["trivial"] = partitions.get("trivial", 0) + int(trivial.sum())
+        rows = np.flatnonzero(~trivial)
+        labels = _canonical_partitions(block[rows])
+        keys = [hashlib.blake2b(row.tobytes(), digest_size=16).digest() for row in labels]
+        new = {}
+        for i, key in zip(rows, keys):
+            if key not in partitions and key not in new:
+                new[key] = i
+        if new:
+            for key, entropy in zip(new, _entropies(block[list(new.values())])):
+                partitions[key] = float(entropy)
+        out[start + rows] = [partitions[key] for key in keys]
+    return out
+
+def _anytime_top(matrix, idx, frequencies, k=5, chunk_size=256, max_evaluations=None, partitions=None,
+                 solutions=None):
+    """Bounded top-k search behind iter_rank_suggestions over guess rows idx.
+
+    Guesses are scored against the solution columns, which default to idx itself.
+    Yields (positions, scores, entropies, evaluated, complete) after each chunk; positions
+    index into idx. Passing a partitions dict scores through _partition_entropies.
+    """
+    if solutions is None:
+        solutions = idx
+    total = len(idx)
+    # Tiny slack so float rounding in the entropy can never exceed the bound
+    max_entropy = math.log2(min(len(solutions), NUM_PATTERNS)) * (1 + 1e-12)
+    order = np.argsort(-frequencies, kind='stable')
+    limit = total if max_evaluations is None else min(total, max_evaluations)
+    positions = np.empty(0, dtype=np.intp)
+    scores = entropies = np.empty(0)
+    evaluated = 0
+    while True:
+        chunk = order[evaluated:min(evaluated + chunk_size, limit)]
+        if len(chunk):
+            if partitions is None:
+                chunk_entropies = batch_entropy(idx[chunk], solutions, matrix)
+            else:
+                chunk_entropies = _partition_entropies(idx[chunk], solutions, matrix, partitions)
+            positions, scores, entropies = _merge_top(
+                np.concatenate([positions, chunk]),
+                np.concatenate([scores, chunk_entropies * frequencies[chunk]]),
+                np.concatenate([entropies, chunk_entropies]),
+                k,
+            )
+            evaluated += len(chunk)
+            metrics.incr("guesses_scored", len(chunk))
+        complete = evaluated == total or bool(
+            len(scores) == k and max_entropy * frequencies[order[evaluated]] < scores[-1]
+        )
+        if complete:
+            metrics.incr("guesses_pruned", total - evaluated)
+        yield positions, scores, entropies, evaluated, complete
+        if complete or evaluated >= limit:
+            return
+
+@timed("rank_suggestions_partitioned")
+def rank_suggestions_partitioned(candidates, greens, yellows, grays, chunk_size=256, guesses=None):
+    """rank_suggestions with entropy computed once per partition class of the candidates.
+
+    Late in a game many guesses split the candidates identically; their code vectors
+    hash to the same class, so one entropy serves them all and the class winner is
+    simply its most frequent member. Results equal rank_suggestions().
+    """
+    valid, matrix, idx, solutions, frequencies = _ranking_inputs(candidates, greens, yellows, grays, guesses)
+    if not valid:
+        return PartitionedRanking([], 0, 0, 0)
+    partitions = {}
+    for positions, scores, entropies, evaluated, _ in _anytime_top(
+        matrix, idx, frequencies, chunk_size=chunk_size, partitions=partitions, solutions=solutions
+    ):
+        pass
+    trivial = partitions.pop("trivial", 0)
+    metrics.incr("partition_guesses", evaluated)
+    metrics.incr("partition_classes", len(partitions))
+    metrics.incr("partition_trivial", trivial)
+    top5 = [
+        (valid[i], float(s), float(e), float(frequencies[i]))
+        for i, s, e in zip(positions, scores, entropies)
+    ]
+    return PartitionedRanking(top5, evaluated, len(partitions), trivial)
+
+def rank_within_budget(candidates, greens, yellows, grays, time_budget=None, max_evaluations=None, guesses=None):
+    """Last snapshot of iter_rank_suggestions under a latency budget in seconds."""
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+    snapshot = None
+    for snapshot in iter_rank_suggestions(
+        candidates, greens, yellows, grays, deadline=deadline, max_evaluations=max_evaluations, guesses=guesses
+    ):
+        pass
+    return snapshot
+
+def rank_suggestions_sampled(candidates, greens, yellows, grays, sample_size=512, seed=0, z=2.58, chunk_size=256):
+    """Approximate rank_suggestions by scoring guesses against a seeded candidate sample.
+
+    Every guess visited gets an entropy confidence interval from the sample, in the same
+    frequency order and with the same early stop as iter_rank_suggestions. Guesses whose
+    interval could still reach the top 5 are re-scored exactly, so reported scores are
+    exact; small sets (under twice the sample) are ranked exactly outright.
+    """
+    valid, matrix, idx, frequencies = _scoring_inputs(candidates, greens, yellows, grays)
+    total = len(valid)
+    if total <= 2 * sample_size:
+        return SampledRanking(rank_suggestions(candidates, greens, yellows, grays), total, total)
+    rng = np.random.default_rng(seed)
+    sample = idx[np.sort(rng.choice(total, sample_size, replace=False))]
+    max_entropy = math.log2(NUM_PATTERNS) * (1 + 1e-12)
+    order = np.argsort(-frequencies, kind='stable')
+    lower = np.empty(0)
+    upper = np.empty(0)
+    evaluated = 0
+    while evaluated < total:
+        chunk = order[evaluated:evaluated + chunk_size]
+        estimate, half_width = _sampled_entropies(matrix[np.ix_(idx[chunk], sample)], z)
+        lower = np.concatenate([lower, (estimate - half_width) * frequencies[chunk]])
+        upper = np.concatenate([upper, (estimate + half_width) * frequencies[chunk]])
+        evaluated += len(chunk)
+        # 5th best pessimistic score; no unvisited guess can be optimistic enough to beat it
+        cutoff = np.sort(lower)[-5] if len(lower) >= 5 else -np.inf
+        if evaluated < total and max_entropy * frequencies[order[evaluated]] < cutoff:
+            break
+    borderline = np.sort(order[:evaluated][upper >= cutoff])
+    entropies = batch_entropy(idx[borderline], idx, matrix)
+    positions, scores, entropies = _merge_top(borderline, entropies * frequencies[borderline], entropies)
+    top5 = [
+        (valid[i], float(s), float(e), float(frequencies[i]))
+        for i, s, e in zip(positions, scores, entropies)
+    ]
+    return SampledRanking(top5, len(borderline), total)
+
+def _board_scores(codes, boards, sizes, objective):
+    """Joint score of each guess row of codes against several boards' candidate columns.
+
+    boards gives the board of every column; one offset bincount histograms all
+    (guess, board) pairs. "entropy" sums the boards' entropies; "solve" sums the
+    chance of leaving each board with a single candidate (including solving it now).
+    """
+    rows = codes.shape[0]
+    nb = len(sizes)
+    offsets = (np.arange(rows, dtype=np.intp)[:, None] * nb + boards) * NUM_PATTERNS
+    counts = np.bincount((codes + offsets).ravel(), minlength=rows * nb * NUM_PATTERNS)
+    counts = counts.reshape(rows, nb, NUM_PATTERNS).astype(np.float64)
+    if objective == "solve":
+        return ((counts == 1).sum(axis=2) / sizes).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        plogp = np.where(counts > 0, counts * np.log2(counts), 0.0)
+    return (np.log2(sizes) - plogp.sum(axis=2) / sizes).sum(axis=1)
+
+@timed("rank_multi_board")
+def rank_multi_board(boards, objective="entropy", k=5, chunk_size=256):
+    """Top k (word, score, value, frequency) guesses for several unsolved boards at once.
+
+    boards holds each board's remaining candidates (solved boards are simply left out).
+    Guesses come from the union of the candidates; every guess's pattern row is read
+    once for all boards' columns together. score = joint value * frequency, and guesses
+    are visited by descending frequency with the per-board bound (log2(min(n, 243)) bits,
+    or min(n, 243) / n singletons) so the search stops once the top k is final.
+    """
+    if objective not in MULTI_BOARD_OBJECTIVES:
+        raise ValueError(f"unknown objective {objective!r}")
+    boards = [b for b in boards if b]
+    if not boards:
+        return []
+    union = list(dict.fromkeys(w for b in boards for w in b))
+    valid, matrix, idx, frequencies = _scoring_inputs(union, {}, {}, set())
+    position = {w: i for i, w in enumerate(valid)}
+    columns = idx[[position[w] for b in boards for w in b]]
+    board_of = np.repeat(np.arange(len(boards)), [len(b) for b in boards])
+    sizes = np.array([len(b) for b in boards], dtype=np.float64)
+    if objective == "solve":
+        max_value = float((np.minimum(sizes, NUM_PATTERNS) / sizes).sum())
+    else:
+        max_value = float(np.log2(np.minimum(sizes, NUM_PATTERNS)).sum())
+    max_value *= 1 + 1e-12
+
+    order = np.argsort(-frequencies, kind='stable')
+    chunk_size = max(1, min(chunk_size, CHUNK_CELLS // len(columns)))
+    positions = np.empty(0, dtype=np.intp)
+    scores = values = np.empty(0)
+    evaluated = 0
+    while evaluated < len(valid):
+        chunk = order[evaluated:evaluated + chunk_size]
+        chunk_values = _board_scores(matrix[np.ix_(idx[chunk], columns)], board_of, sizes, objective)
+        positions, scores, values = _merge_top(
+            np.concatenate([positions, chunk]),
+            np.concatenate([scores, chunk_values * frequencies[chunk]]),
+            np.concatenate([values, chunk_values]),
+            k,
+        )
+        evaluated += len(chunk)
+        if evaluated < len(valid) and len(scores) == k and max_value * frequencies[order[evaluated]] < scores[-1]:
+            break
+    metrics.incr("guesses_scored", evaluated)
     return [
-        word for word in candidates
-        if matches_feedback(guess, word, feedback)
-        and enforce_hard_mode(word, greens, yellows, grays)
-    ]
\ No newline at end of file
+        (valid[i], float(s), float(v), float(frequencies[i]))
+        for i, s, v in zip(positions, scores, values)
+    ]
+
+def _next_turn_entropy(members, matrix, frequencies):
+    """Entropy of the guess rank_suggestions would play within a bucket of matrix rows."""
+    for _, _, entropies, _, _ in _anytime_top(matrix, members, frequencies, k=1):
+        pass
+    return float(entropies[0])
+
+@timed("rank_suggestions_lookahead")
+def rank_suggestions_lookahead(candidates, greens, yellows, grays, top_k=10):
+    """Top 5 by two-step value: entropy now plus the expected entropy of the best next guess.
+
+    Only the top_k guesses of the one-step ranking are expanded. Each expansion splits
+    the candidates by feedback, and every bucket is worth the entropy of the guess
+    rank_suggestions would pick there (found with the same early-stopping search).
+    Bucket results are cached by their members, since sibling guesses often leave
+    identical buckets; buckets of one or two words have closed forms (0 and 1 bit); and
+    a guess whose bound entropy + sum(p * log2(min(|bucket|, 243))) cannot beat the 5th
+    best is skipped. Scores keep the frequency weighting: two-step value * frequency.
+    """
+    for snapshot in iter_rank_suggestions(candidates, greens, yellows, grays, k=top_k):
+        pass
+    if not snapshot.top5:
+        return LookaheadRanking([], 0, 0, 0, 0)
+    valid, matrix, idx, frequencies = _scoring_inputs(candidates, greens, yellows, grays)
+    position = {w: i for i, w in enumerate(valid)}
+    # Frequencies by matrix row, so buckets of rows can be ranked directly
+    row_frequencies = np.zeros(matrix.shape[0])
+    row_frequencies[idx] = frequencies
+    n = len(valid)
+    cache = {}
+    scored = avoided = expanded = 0
+    results = []
+    for word, _, entropy, freq in snapshot.top5:
+        codes = matrix[idx[position[word]], idx]
+        order = np.argsort(codes, kind='stable')
+        splits = np.flatnonzero(np.diff(codes[order])) + 1
+        # The all-green bucket is the guess itself: that branch is already solved
+        buckets = [
+            np.sort(idx[group]) for group in np.split(order, splits) if codes[group[0]] != ALL_GREEN
+        ]
+        bound = entropy + sum(len(b) * math.log2(min(len(b), NUM_PATTERNS)) for b in buckets) / n
+        if len(results) >= 5 and bound * freq < sorted(r[1] for r in results)[-5]:
+            avoided += len(buckets)
+            continue
+        expanded += 1
+        expected = 0.0
+        for members in buckets:
+            if len(members) <= 2:
+                avoided += 1
+                best = float(len(members) - 1)
+            else:
+                key = members.tobytes()
+                if key in cache:
+                    avoided += 1
+                else:
+                    scored += 1
+                    cache[key] = _next_turn_entropy(members, matrix, row_frequencies[members])
+                best = cache[key]
+            expected += len(members) * best
+        value = entropy + expected / n
+        results.append((word, value * freq, value, freq))
+    metrics.incr("lookahead_partitions_scored", scored)
+    metrics.incr("lookahead_partitions_avoided", avoided)
+    # Stable: ties keep the one-step order
+    results.sort(key=lambda r: -r[1])
+    return LookaheadRanking(results[:5], expanded, len(valid) - expanded, scored, avoided)
+
+@timed("filter_candidates")
+def filter_candidates(candidates, guess, feedback, greens, yellows, grays):
+    if not candidates:
+        return []
+    pm = get_pattern_matrix()
+    idx = pm.indices(candidates)
+    # One matrix row gives the pattern against every candidate
+    if idx is not None and guess in pm.index:
+        metrics.incr("filter_matrix_hits")
+        codes = pm.matrix[pm.index[guess], idx]
+    else:
+        metrics.incr("filter_matrix_misses")
+        codes = feedback_codes(guess, words_to_array(candidates))
+    keep = (codes == encode_feedback(feedback)) & _hard_mode_mask(candidates, idx, greens, yellows, grays)
+    result = [word for word, k in zip(candidates, keep) if k]
+    metrics.incr("filter_candidates_in", len(candidates))
+    metrics.incr("filter_candidates_out", len(result))
+    return result
@@ -0,0 +1,152 @@
+# suggestion_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import numpy as np
+from opening_book import book_key
+from wordlist import app_data_dir
+
+CACHE_FILENAME = "suggestion_cache.sqlite"
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Seconds a writer waits for another process's lock before giving up
+LOCK_TIMEOUT = 10.0
+
+# Strictly increasing use stamp, so LRU order is exact even within one clock tick
+_NOW = "MAX(?, COALESCE((SELECT MAX(last_used) FROM suggestions), 0) + 1e-6)"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS suggestions (
+    key BLOB PRIMARY KEY,
+    result TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS suggestions_last_used ON suggestions (last_used);
+CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+
+class SuggestionCache:
+    """Top-k suggestions persisted in SQLite, keyed by canonical game state.
+
+    The state is the set of surviving candidates, which fixes the greens, yellows and
+    grays when every word can be the answer. With an answer pool it does not, so the
+    mask of hard-mode-valid guesses joins the key. Both are hashed together with
+    book_key(words) -- word list, frequencies and SCORING_VERSION -- so stale results
+    are never read. WAL mode and
+    a lock timeout let several processes share one file; entries are evicted least
+    recently used once their total size exceeds max_bytes.
+    """
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path or os.path.join(app_data_dir(), CACHE_FILENAME)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._namespaces = {}
+        self._db = sqlite3.connect(self.path, timeout=LOCK_TIMEOUT, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def _namespace(self, words):
+        # book_key hashes the whole list; remember it per list object
+        entry = self._namespaces.get(id(words))
+        if entry is None or entry[0] is not words:
+            entry = (words, book_key(words) + CACHE_VERSION.to_bytes(4, "little"))
+            self._namespaces[id(words)] = entry
+        return entry[1]
+
+    def key(self, words, candidate_indices, kind="rank", guess_mask=None):
+        """Stable key for a ranking of kind over the candidates at these positions of words,
+        scoring the words in guess_mask as guesses when given."""
+        h = hashlib.sha256(self._namespace(words))
+        h.update(repr(kind).encode())
+        h.update(np.sort(np.asarray(candidate_indices, dtype='<u4')).tobytes())
+        if guess_mask is not None:
+            h.update(np.packbits(guess_mask).tobytes())
+        return h.digest()
+
+    def _bump(self, name):
+        self._db.execute(
+            "INSERT INTO stats (name, value) VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+
+    def get(self, key):
+        """Cached suggestions as (word, score, entropy, frequency) tuples, or None."""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._db.execute("SELECT result FROM suggestions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                self._bump("misses")
+            else:
+                self.hits += 1
+                self._bump("hits")
+                self._db.execute(f"UPDATE suggestions SET last_used = {_NOW} WHERE key = ?", (time.time(), key))
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        return None if row is None else [tuple(s) for s in json.loads(row[0])]
+
+    def put(self, key, suggestions):
+        result = json.dumps([list(s) for s in suggestions])
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO suggestions (key, result, size, last_used) VALUES (?, ?, ?, {_NOW})",
+                (key, result, len(key) + len(result), time.time()),
+            )
+            self._evict()
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM suggestions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self._db.execute("SELECT key, size FROM suggestions ORDER BY last_used").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM suggestions WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        self._db.execute(
+            "INSERT INTO stats (name, value) VALUES ('evictions', ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (evicted,),
+        )
+
+    def get_or_compute(self, key, compute):
+        suggestions = self.get(key)
+        if suggestions is None:
+            suggestions = compute()
+            self.put(key, suggestions)
+        return suggestions
+
+    def stats(self):
+        """Hit/miss counts for this process and for the file across all processes."""
+        totals = dict(self._db.execute("SELECT name, value FROM stats").fetchall())
+        entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM suggestions").fetchone()
+        lookups = totals.get("hits", 0) + totals.get("misses", 0)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "total_hits": totals.get("hits", 0),
+            "total_misses": totals.get("misses", 0),
+            "hit_rate": totals.get("hits", 0) / lookups if lookups else 0.0,
+            "evictions": totals.get("evictions", 0),
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,21 @@
+# tests/test_benchmark.py
+import unittest
+from benchmark import compare, run_benchmark
+
+WORDS = ["crane", "slate", "clash", "crony", "trace", "apple", "angle", "alien"]
+
+class TestBenchmark(unittest.TestCase):
+    def test_every_answer_is_played(self):
+        result = run_benchmark(WORDS, WORDS, use_book=False)
+        self.assertEqual(result["games"], len(WORDS))
+        self.assertEqual(sum(result["distribution"].values()), len(WORDS))
+        self.assertEqual(result["distribution"].get("1"), 1)  # the opener itself
+        self.assertGreater(result["games_per_sec"], 0)
+
+    def test_compare_flags_regressions(self):
+        baseline = {"games_per_sec": 100.0}
+        self.assertIsNone(compare({"games_per_sec": 95.0}, baseline, 0.1))
+        self.assertIsNotNone(compare({"games_per_sec": 80.0}, baseline, 0.1))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+# tests/test_cli.py
+import io
+import json
+import unittest
+from cli import run_batch, solve, solve_multi
+from game_state import GameState
+from solver import rank_suggestions_lookahead
+from wordlist import load_wordle_list
+
+WORDS = ["crane", "slate", "clash", "crony", "trace", "apple", "angle", "alien"]
+
+class TestBatch(unittest.TestCase):
+    def test_batch_matches_single_solve(self):
+        stream = io.StringIO(
+            '{"id": "a", "history": [["crane", "bbgbg"]]}\n'
+            '\n'
+            '{"id": "b", "history": [{"guess": "apple", "feedback": "GBBBB"}]}\n'
+        )
+        out = io.StringIO()
+        run_batch(stream, out, WORDS)
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([r["id"] for r in results], ["a", "b"])
+        candidates, suggestions, complete = solve(WORDS, [("crane", "BBGBG")])
+        self.assertTrue(complete)
+        self.assertEqual(results[0]["remaining"], len(candidates))
+        self.assertEqual([s["word"] for s in results[0]["suggestions"]], [w for w, *_ in suggestions])
+
+    def test_evaluation_budget(self):
+        _, suggestions, complete = solve(WORDS, [], max_evaluations=2)
+        self.assertFalse(complete)
+        self.assertLessEqual(len(suggestions), 2)
+
+    def test_budgeted_batch_stops_early_with_json_output(self):
+        # Past the opening book, so the anytime ranking prunes the full list
+        record = '{"id": 1, "history": [["fuzzy", "BBBBB"], ["jumpy", "BBBBB"]]}\n'
+        out = io.StringIO()
+        run_batch(io.StringIO(record), out, load_wordle_list(), max_evaluations=100000)
+        result = json.loads(out.getvalue())
+        self.assertIs(result["complete"], True)
+        self.assertEqual(len(result["suggestions"]), 5)
+
+    def test_lookahead_is_not_served_from_the_book(self):
+        words = load_wordle_list()
+        state = GameState(words)
+        state.apply("about", "BYBBB")
+        expected = rank_suggestions_lookahead(state.candidates, state.greens, state.yellows, state.grays, 10).top5
+        self.assertEqual(solve(words, [("about", "BYBBB")], lookahead=10)[1], expected)
+
+    def test_multi_board_drops_solved_boards(self):
+        remaining, suggestions = solve_multi(WORDS, [("crane", ["GGGGG", "BBBBB"])], 2)
+        self.assertIsNone(remaining[0])
+        self.assertEqual(remaining[1], solve(WORDS, [("crane", "BBBBB")])[0])
+        self.assertEqual([w for w, *_ in suggestions], [w for w, *_ in solve(WORDS, [("crane", "BBBBB")])[1]])
+        out = io.StringIO()
+        run_batch(io.StringIO('{"id": 1, "boards": 2, "history": [["crane", ["GGGGG", "bbbbb"]]]}\n'), out, WORDS)
+        self.assertEqual(json.loads(out.getvalue())["remaining"], [None, len(remaining[1])])
+
+    def test_batch_reports_bad_records(self):
+        out = io.StringIO()
+        run_batch(io.StringIO('{"id": 7, "history": [["cran", "BB"]]}\nnot json\n'), out, WORDS)
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]["id"], 7)
+        self.assertIn("error", results[0])
+        self.assertIn("error", results[1])
+
+    def test_batch_rejects_invalid_letters_per_line(self):
+        out = io.StringIO()
+        run_batch(io.StringIO(
+            '{"id": 1, "history": [["crane", "BBGBG"]]}\n'
+            '{"id": 2, "history": [["12345", "BBBBB"]]}\n'
+            '{"id": 3, "history": [["crane", "XXXXX"]]}\n'
+            '{"id": 4, "history": [["slate", "bbbbb"]]}\n'
+        ), out, load_wordle_list())
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([r["id"] for r in results], [1, 2, 3, 4])
+        self.assertNotIn("error", results[0])
+        self.assertIn("error", results[1])
+        self.assertIn("error", results[2])
+        self.assertNotIn("error", results[3])
+        self.assertGreater(results[3]["remaining"], 0)
+
+    def test_answers_pool_rejects_candidate_only_rankings(self):
+        answers = ["crane", "clash", "apple"]
+        candidates, suggestions, complete = solve(WORDS, [("slate", "BBGBG")], answers=answers)
+        self.assertEqual(candidates, ["crane"])
+        self.assertEqual(suggestions[0][0], "crane")
+        self.assertTrue(complete)
+        for options in ({"lookahead": 3}, {"sample_size": 16}):
+            with self.assertRaises(ValueError):
+                solve(WORDS, [], answers=answers, **options)
+
+if __name__ == "__main__":
+    unittest.main()
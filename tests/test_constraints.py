@@ -0,0 +1,26 @@
+# tests/test_constraints.py
+import unittest
+from constraints import ConstraintIndex
+from feedback import enforce_hard_mode, get_feedback, update_constraints
+
+WORDS = ["apple", "allee", "angle", "alien", "crane", "slate", "eerie", "geese", "llama", "sheep"]
+
+class TestConstraintIndex(unittest.TestCase):
+    def test_mask_matches_enforce_hard_mode(self):
+        index = ConstraintIndex(WORDS)
+        for guess in WORDS:
+            for solution in WORDS:
+                greens = {}
+                yellows = {}
+                grays = set()
+                update_constraints(guess, get_feedback(guess, solution), greens, yellows, grays)
+                expected = [enforce_hard_mode(w, greens, yellows, grays) for w in WORDS]
+                self.assertEqual(list(index.mask(greens, yellows, grays)), expected, (guess, solution))
+
+    def test_at_least_counts_duplicates(self):
+        index = ConstraintIndex(WORDS)
+        e = ord('e') - 97
+        self.assertEqual([WORDS[i] for i in index.at_least[e, 3].nonzero()[0]], ["eerie", "geese"])
+
+if __name__ == "__main__":
+    unittest.main()
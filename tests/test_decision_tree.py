@@ -0,0 +1,59 @@
+# tests/test_decision_tree.py
+import os
+import tempfile
+import unittest
+import numpy as np
+from decision_tree import TreeSearch, DecisionTree, load_tree, save_tree
+from feedback import get_feedback
+from patterns import compute_patterns, words_to_array
+
+WORDS = ["crane", "slate", "clash", "crony", "trace", "apple", "angle", "alien", "eerie", "geese"]
+
+def _matrix(words):
+    arr = words_to_array(words)
+    return compute_patterns(arr, arr)
+
+def _play(tree, answer):
+    history = []
+    while True:
+        guess = tree.suggest(history)
+        feedback = get_feedback(guess, answer)
+        history.append((guess, feedback))
+        if feedback == "GGGGG":
+            return len(history)
+
+class TestDecisionTree(unittest.TestCase):
+    def test_tree_solves_every_answer(self):
+        search = TreeSearch(_matrix(WORDS), beam=len(WORDS))
+        nodes, edges = search.build(np.arange(len(WORDS)))
+        tree = DecisionTree(WORDS, nodes, edges)
+        total = sum(_play(tree, answer) for answer in WORDS)
+        # Tree cost reported by the search equals the guesses actually used
+        self.assertEqual(total, search.solve(np.arange(len(WORDS))))
+        self.assertTrue(search.exact)
+
+    def test_pruning_keeps_optimum(self):
+        # Exhaustive beam with branch-and-bound must match the greedy tree or beat it
+        full = TreeSearch(_matrix(WORDS), beam=len(WORDS))
+        greedy = TreeSearch(_matrix(WORDS), beam=1)
+        everything = np.arange(len(WORDS))
+        self.assertLessEqual(full.solve(everything), greedy.solve(everything))
+        worst = TreeSearch(_matrix(WORDS), objective="worst", beam=len(WORDS))
+        self.assertLessEqual(worst.solve(everything), 3)
+
+    def test_budget_and_roundtrip(self):
+        search = TreeSearch(_matrix(WORDS), max_nodes=0)
+        nodes, edges = search.build(np.arange(len(WORDS)))
+        self.assertFalse(search.exact)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tree.bin")
+            save_tree(WORDS, nodes, edges, path)
+            tree = load_tree(WORDS, path)
+            self.assertEqual(len(tree), len(nodes))
+            for answer in WORDS:
+                self.assertLessEqual(_play(tree, answer), len(WORDS))
+            self.assertIsNone(tree.suggest([("qxzqx", "BBBBB")]))
+            self.assertIsNone(load_tree(WORDS[:-1], path))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 # tests/test_feedback.py
 import unittest
-from feedback import get_feedback, update_constraints
+from feedback import feedback_codes, filter_by_pattern, get_feedback, update_constraints
+from patterns import decode_pattern, words_to_array
 
 class TestFeedback(unittest.TestCase):
     def test_feedback_basic(self):
@@ -11,6 +12,21 @@ class TestFeedback(unittest.TestCase):
         # apple vs allee
         self.assertEqual(get_feedback("apple", "allee"), "GBBYG")
 
+    def test_feedback_codes_match_get_feedback(self):
+        words = ["apple", "allee", "crane", "slate", "eerie", "geese", "sheep", "llama", "lolly", "level"]
+        solutions = words_to_array(words)
+        for guess in words:
+            codes = feedback_codes(guess, solutions)
+            self.assertEqual([decode_pattern(c) for c in codes], [get_feedback(guess, s) for s in words])
+        self.assertEqual(decode_pattern(feedback_codes("apple", words_to_array(["allee"]))[0]), "GBBYG")
+        self.assertEqual(decode_pattern(feedback_codes("allee", words_to_array(["apple"]))[0]), "GYBBG")
+
+    def test_filter_by_pattern(self):
+        words = ["apple", "angle", "alien", "amber", "annex"]
+        matches = filter_by_pattern("apple", get_feedback("apple", "angle"), words_to_array(words))
+        self.assertIn(words.index("angle"), matches)
+        self.assertNotIn(words.index("apple"), matches)
+
     def test_update_constraints(self):
         greens = {}
         yellows = {}
@@ -0,0 +1,66 @@
+# tests/test_game_state.py
+import unittest
+from collections import defaultdict
+from feedback import get_feedback, update_constraints
+from game_state import GameState
+from solver import filter_candidates
+
+WORDS = ["crane", "slate", "clash", "crony", "trace", "apple", "angle", "alien", "eerie", "geese"]
+
+class TestGameState(unittest.TestCase):
+    def test_matches_filter_candidates(self):
+        for words in (WORDS, WORDS + ["qxzqx"]):
+            state = GameState(words)
+            candidates, greens, yellows, grays = words, {}, defaultdict(set), set()
+            for guess in ["slate", "crony"]:
+                feedback = get_feedback(guess, "clash")
+                state.apply(guess, feedback)
+                update_constraints(guess, feedback, greens, yellows, grays)
+                candidates = filter_candidates(candidates, guess, feedback, greens, yellows, grays)
+                self.assertEqual(state.candidates, candidates)
+                self.assertEqual(state.greens, greens)
+
+    def test_undo_redo_reuses_cached_suggestions(self):
+        state = GameState(WORDS)
+        first = state.suggestions()
+        state.apply("slate", get_feedback("slate", "crane"))
+        second = state.suggestions()
+        self.assertTrue(state.undo())
+        self.assertFalse(state.undo())
+        self.assertIs(state.suggestions(), first)
+        self.assertEqual(state.candidates, WORDS)
+        self.assertTrue(state.redo())
+        self.assertFalse(state.redo())
+        self.assertIs(state.suggestions(), second)
+        self.assertEqual(state.history, [("slate", get_feedback("slate", "crane"))])
+
+    def test_independent_games_and_fast_mode(self):
+        a, b = GameState(WORDS), GameState(WORDS)
+        a.apply("qxzqx", "BBBBB")
+        self.assertEqual(a.mode, "fast")
+        self.assertEqual(b.mode, "entropy")
+        self.assertEqual(len(b), len(WORDS))
+        a.restart()
+        self.assertEqual(a.history, [])
+
+    def test_answer_pool_with_fallback(self):
+        answers = ["crane", "clash", "apple", "angle"]
+        state = GameState(WORDS, answers)
+        self.assertEqual(state.candidates, answers)
+        state.apply("slate", get_feedback("slate", "clash"))
+        self.assertEqual(state.candidates, ["clash"])
+        # Every hard-mode-valid word is a guess; the lone answer wins
+        self.assertEqual(state.guesses, [w for w, ok in zip(WORDS, state.consistent) if ok])
+        self.assertEqual(state.suggestions()[0][0], "clash")
+        # An answer outside the pool: candidates continue over every word
+        full = GameState(WORDS)
+        state.restart()
+        for guess in ["slate", "crane"]:
+            feedback = get_feedback(guess, "trace")
+            state.apply(guess, feedback)
+            full.apply(guess, feedback)
+        self.assertEqual(state.candidates, full.candidates)
+        self.assertIn("trace", state.candidates)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+# tests/test_metrics.py
+import json
+import unittest
+from metrics import Metrics, metrics
+from solver import filter_candidates
+
+WORDS = ["crane", "slate", "clash", "crony", "trace"]
+
+class TestMetrics(unittest.TestCase):
+    def tearDown(self):
+        metrics.disable()
+        metrics.reset()
+
+    def test_disabled_records_nothing(self):
+        filter_candidates(WORDS, "slate", "BBYBY", {}, {}, set())
+        self.assertEqual(metrics.snapshot(), {"counters": {}, "timers": {}})
+
+    def test_hot_paths_recorded_when_enabled(self):
+        metrics.enable()
+        result = filter_candidates(WORDS, "slate", "BBYBY", {}, {'a': {2}, 'e': {4}}, {'s', 'l', 't'})
+        snapshot = json.loads(metrics.to_json())
+        self.assertEqual(snapshot["counters"]["filter_candidates_in"], len(WORDS))
+        self.assertEqual(snapshot["counters"]["filter_candidates_out"], len(result))
+        self.assertEqual(snapshot["timers"]["filter_candidates"]["count"], 1)
+
+    def test_prometheus_text(self):
+        m = Metrics()
+        m.enable()
+        m.incr("filter.hits", 3)
+        m.observe("rank", 0.5)
+        m.observe("rank", 1.5)
+        text = m.to_prometheus()
+        self.assertIn("# TYPE wordle_filter_hits_total counter\nwordle_filter_hits_total 3\n", text)
+        self.assertIn("wordle_rank_seconds_count 2\n", text)
+        self.assertIn("wordle_rank_seconds_sum 2.000000000\n", text)
+        self.assertIn("wordle_rank_seconds_max 1.500000000\n", text)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+# tests/test_opening_book.py
+import os
+import tempfile
+import unittest
+from feedback import get_feedback, update_constraints
+from opening_book import build_opening_book, load_opening_book
+from solver import filter_candidates, rank_suggestions
+
+WORDS = ["crane", "slate", "clash", "crony", "trace", "apple", "angle", "alien"]
+
+class TestOpeningBook(unittest.TestCase):
+    def test_book_matches_live_ranking(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "book.bin")
+            build_opening_book(WORDS, path, openers=2)
+            book = load_opening_book(WORDS, path)
+            self.assertEqual(book.first(), rank_suggestions(WORDS, {}, {}, set()))
+            opener = book.first()[0][0]
+            for solution in WORDS:
+                feedback = get_feedback(opener, solution)
+                greens = {}
+                yellows = {}
+                grays = set()
+                update_constraints(opener, feedback, greens, yellows, grays)
+                candidates = filter_candidates(WORDS, opener, feedback, greens, yellows, grays)
+                self.assertEqual(book.second(opener, feedback), rank_suggestions(candidates, greens, yellows, grays))
+
+    def test_uncovered_or_stale_book(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "book.bin")
+            build_opening_book(WORDS, path, openers=1)
+            book = load_opening_book(WORDS, path)
+            uncovered = next(w for w in WORDS if w not in book.openers)
+            self.assertIsNone(book.second(uncovered, "BBBBB"))
+            # A different word list invalidates the book
+            self.assertIsNone(load_opening_book(WORDS[:-1], path))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+# tests/test_patterns.py
+import os
+import tempfile
+import unittest
+from feedback import get_feedback
+from patterns import (
+    compute_patterns, decode_pattern, encode_feedback, load_pattern_matrix, words_to_array,
+)
+
+WORDS = ["apple", "allee", "crane", "slate", "eerie", "geese", "sheep", "llama"]
+
+class TestPatterns(unittest.TestCase):
+    def test_encode_decode_roundtrip(self):
+        self.assertEqual(encode_feedback("BBBBB"), 0)
+        self.assertEqual(encode_feedback("GGGGG"), 242)
+        self.assertEqual(decode_pattern(encode_feedback("GBBYG")), "GBBYG")
+        self.assertEqual(encode_feedback("XXXXX"), -1)
+
+    def test_compute_matches_get_feedback(self):
+        arr = words_to_array(WORDS)
+        codes = compute_patterns(arr, arr)
+        for i, guess in enumerate(WORDS):
+            for j, solution in enumerate(WORDS):
+                self.assertEqual(decode_pattern(codes[i, j]), get_feedback(guess, solution))
+
+    def test_stale_matrix_is_rebuilt(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "patterns.bin")
+            pm = load_pattern_matrix(WORDS[:4], path)
+            self.assertEqual(decode_pattern(pm.code("apple", "allee")), "GBBYG")
+            del pm
+            # A different word list must not reuse the old file
+            pm = load_pattern_matrix(WORDS, path)
+            self.assertEqual(pm.matrix.shape, (len(WORDS), len(WORDS)))
+            self.assertEqual(decode_pattern(pm.code("allee", "apple")), "GYBBG")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+# tests/test_server.py
+import asyncio
+import unittest
+from unittest import mock
+import server
+from cli import format_result, solve
+from server import SolverService, _post, canonical_state, run_load
+
+WORDS = ["crane", "slate", "clash", "crony", "trace", "apple", "angle", "alien"]
+
+async def _exercise(histories, concurrent):
+    service = SolverService(WORDS, batch_window=0.01)
+    await service.start()
+    server = await asyncio.start_server(service.serve_connection, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        results = await asyncio.gather(*(service.suggest(h) for h in concurrent))
+        stats = dict(service.stats)
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        responses = [await _post(reader, writer, "/suggest", {"id": i, "history": h}) for i, h in enumerate(histories)]
+        bad = await _post(reader, writer, "/suggest", {"history": [["cran", "BB"]]})
+        writer.close()
+        load = await run_load("127.0.0.1", port, histories, requests=20, concurrency=4)
+        return results, responses, bad, load, stats
+    finally:
+        server.close()
+        await service.close()
+
+class TestServer(unittest.TestCase):
+    def test_canonical_state_ignores_order_and_repeats(self):
+        a = [("crane", "BYBBB"), ("slate", "BBGBB")]
+        self.assertEqual(canonical_state(a), canonical_state(a[::-1] + a[:1]))
+
+    def test_concurrent_identical_states_share_one_ranking(self):
+        history = [("crane", "BBGBG"), ("slate", "BBYBG")]
+        concurrent = [history, history[::-1], history]
+        histories = [[["crane", "BBGBG"]], [["apple", "GBBBB"]]]
+        results, responses, bad, load, stats = asyncio.run(_exercise(histories, concurrent))
+        self.assertEqual(stats["rankings"], 1)
+        self.assertEqual(stats["coalesced"], 2)
+        # Solved from the first history as sent, not its sorted canonical form
+        self.assertEqual(results[0], format_result(*solve(WORDS, history)))
+        self.assertTrue(all(r is results[0] for r in results))
+        for i, (status, payload) in enumerate(responses):
+            self.assertEqual(status, 200)
+            self.assertEqual(payload["id"], i)
+            expected = format_result(*solve(WORDS, [(g, f.upper()) for g, f in histories[i]]))
+            self.assertEqual(payload["remaining"], expected["remaining"])
+        self.assertEqual(bad[0], 400)
+        self.assertEqual((load["requests"], load["errors"]), (20, 0))
+
+    def test_failing_state_does_not_poison_its_batch(self):
+        good, broken = [("crane", "BBGBG")], [("slate", "BBBBB")]
+
+        def flaky_solve(words, history, **options):
+            if history == broken:
+                raise IndexError("boom")
+            return solve(words, history, **options)
+
+        async def both():
+            service = SolverService(WORDS, batch_window=0.01)
+            await service.start()
+            try:
+                return await asyncio.gather(service.suggest(good), service.suggest(broken)), service.stats["batches"]
+            finally:
+                await service.close()
+
+        with mock.patch.object(server, "solve", flaky_solve):
+            (ok, failed), batches = asyncio.run(both())
+        self.assertEqual(batches, 1)
+        self.assertEqual(ok, format_result(*solve(WORDS, good)))
+        self.assertEqual(failed, {"error": "boom"})
+
+if __name__ == "__main__":
+    unittest.main()
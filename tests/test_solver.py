@@ -1,7 +1,13 @@
 # tests/test_solver.py
 import unittest
-from solver import calculate_entropy, filter_candidates, rank_suggestions
-from feedback import update_constraints, enforce_hard_mode
+from solver import (
+    batch_entropy, calculate_entropy, filter_candidates, rank_multi_board, rank_suggestions, rank_suggestions_lookahead,
+    rank_suggestions_partitioned, rank_suggestions_sampled, _canonical_partitions,
+)
+import numpy as np
+from wordlist import get_frequency, load_wordle_list
+from patterns import compute_patterns, words_to_array
+from feedback import get_feedback, update_constraints, enforce_hard_mode
 
 class TestSolver(unittest.TestCase):
     def test_entropy(self):
@@ -9,6 +15,15 @@ class TestSolver(unittest.TestCase):
         entropy = calculate_entropy("apple", words)
         self.assertTrue(entropy > 0)
 
+    def test_batch_entropy_matches_single(self):
+        words = ["apple", "angle", "alien", "amber", "annex", "eerie"]
+        arr = words_to_array(words)
+        matrix = compute_patterns(arr, arr)
+        # Tiny chunks exercise the chunk boundaries
+        entropies = batch_entropy(range(len(words)), range(len(words)), matrix, chunk_cells=7)
+        for word, entropy in zip(words, entropies):
+            self.assertAlmostEqual(entropy, calculate_entropy(word, words))
+
     def test_filtering(self):
         words = ["apple", "angle", "alien", "amber", "annex"]
         greens = {}
@@ -39,6 +54,93 @@ class TestSolver(unittest.TestCase):
         # Suggestions limited to 5
         self.assertLessEqual(len(suggestions), 5)
 
+    def test_parallel_matches_serial(self):
+        # Includes a word outside the list so the ad hoc matrix path is shared too
+        for candidates in (["crane", "slate", "clash", "crony", "trace", "apple", "angle"],
+                           ["apple", "angle", "alien", "amber", "annex", "qxzqx"]):
+            serial = rank_suggestions(candidates, {}, {}, set())
+            parallel = rank_suggestions(candidates, {}, {}, set(), workers=2, chunk_size=2)
+            self.assertEqual(parallel, serial)
+
+    def test_sampled_ranking_matches_exact_top(self):
+        words = load_wordle_list()[:3000]
+        sampled = rank_suggestions_sampled(words, {}, {}, set(), sample_size=256, seed=1)
+        exact = rank_suggestions(words, {}, {}, set())
+        self.assertEqual(sampled.top5[0], exact[0])
+        self.assertLess(sampled.rescored, sampled.total)
+        # Small sets fall back to exact ranking
+        small = ["crane", "slate", "clash", "crony", "trace"]
+        self.assertEqual(rank_suggestions_sampled(small, {}, {}, set()).top5, rank_suggestions(small, {}, {}, set()))
+
+    def test_lookahead_matches_brute_force(self):
+        words = load_wordle_list()[::250]
+        def two_step(guess):
+            buckets = {}
+            for w in words:
+                if w != guess:
+                    buckets.setdefault(get_feedback(guess, w), []).append(w)
+            nxt = sum(len(b) * rank_suggestions(b, {}, {}, set())[0][2] for b in buckets.values())
+            return calculate_entropy(guess, words) + nxt / len(words)
+        expected = sorted(((w, two_step(w) * get_frequency(w)) for w in words), key=lambda x: -x[1])[:5]
+        result = rank_suggestions_lookahead(words, {}, {}, set(), top_k=len(words))
+        self.assertEqual([w for w, *_ in result.top5], [w for w, _ in expected])
+        for (_, score, _, _), (_, value) in zip(result.top5, expected):
+            self.assertAlmostEqual(score, value)
+        self.assertGreater(result.partitions_avoided, 0)
+        self.assertEqual(result.expanded + result.pruned, len(words))
+
+    def test_multi_board_sums_board_entropies(self):
+        words = load_wordle_list()[:2000]
+        self.assertEqual(rank_multi_board([words]), rank_suggestions(words, {}, {}, set()))
+        boards = [["crane", "slate", "clash", "crony"], ["apple", "angle", "alien", "crane", "qxzqx"]]
+        union = list(dict.fromkeys(boards[0] + boards[1]))
+        expected = sorted(
+            ((w, sum(calculate_entropy(w, b) for b in boards) * get_frequency(w)) for w in union),
+            key=lambda x: -x[1],
+        )[:5]
+        result = rank_multi_board(boards)
+        self.assertEqual([w for w, *_ in result], [w for w, _ in expected])
+        for (_, score, _, _), (_, value) in zip(result, expected):
+            self.assertAlmostEqual(score, value)
+        # "solve" counts the chance of leaving each board with one candidate
+        word, _, value, _ = rank_multi_board(boards, "solve")[0]
+        singles = sum(
+            sum(1 for w in b if [get_feedback(word, x) for x in b].count(get_feedback(word, w)) == 1) / len(b)
+            for b in boards
+        )
+        self.assertAlmostEqual(value, singles)
+        self.assertEqual(rank_multi_board([[], []]), [])
+
+    def test_partition_dedup_matches_exact(self):
+        codes = np.array([[5, 3, 5, 9, 3], [7, 2, 7, 4, 2], [1, 1, 2, 0, 0]], dtype=np.uint8)
+        labels = _canonical_partitions(codes)
+        self.assertEqual(labels[0].tolist(), labels[1].tolist())
+        self.assertEqual(labels[2].tolist(), [0, 0, 1, 2, 2])
+        for candidates in (["fight", "might", "night", "light", "right", "sight"], load_wordle_list()[:500]):
+            result = rank_suggestions_partitioned(candidates, {}, {}, set())
+            self.assertEqual(result.top5, rank_suggestions(candidates, {}, {}, set()))
+            self.assertLessEqual(result.classes + result.trivial, result.guesses)
+        # A final pair: either word splits them the same way
+        pair = rank_suggestions_partitioned(["fight", "might"], {}, {}, set())
+        self.assertEqual((pair.guesses, pair.classes, pair.trivial), (2, 1, 0))
+
+    def test_separate_guess_pool_matches_brute_force(self):
+        words = load_wordle_list()
+        for answers, guesses in ((words[:300], words[:3000]), (["fight", "might", "night"], words[:3000] + ["qxzqx"])):
+            expected = sorted(
+                ((w, calculate_entropy(w, answers) * get_frequency(w)) for w in guesses),
+                key=lambda x: -x[1],
+            )[:5]
+            for workers in (1, 2):
+                result = rank_suggestions(answers, {}, {}, set(), workers, 512, guesses=guesses)
+                self.assertEqual([w for w, *_ in result], [w for w, _ in expected])
+                for (_, score, _, _), (_, value) in zip(result, expected):
+                    self.assertAlmostEqual(score, value)
+            self.assertEqual(rank_suggestions_partitioned(answers, {}, {}, set(), guesses=guesses).top5, result)
+        # With two answers left only they can win this turn
+        self.assertEqual({w for w, *_ in rank_suggestions(["fight", "might"], {}, {}, set(), guesses=words)},
+                         {"fight", "might"})
+
     def test_empty_after_over_filter(self):
         candidates = ["apple", "angle"]
         greens = {0: 'z'}  # Impossible constraint
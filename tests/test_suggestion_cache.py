@@ -0,0 +1,80 @@
+# tests/test_suggestion_cache.py
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from cli import solve
+from suggestion_cache import SuggestionCache
+from wordlist import load_answer_list, load_wordle_list
+
+WORDS = ["crane", "slate", "clash", "crony", "trace", "apple", "angle", "alien"]
+
+def _fill(args):
+    path, worker = args
+    cache = SuggestionCache(path)
+    for i in range(20):
+        key = cache.key(WORDS, [worker, i + 8])
+        cache.get_or_compute(key, lambda: [("crane", 1.0, 2.0, 0.5)])
+    cache.close()
+    return worker
+
+class TestSuggestionCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_solve_reuses_cached_ranking(self):
+        cache = SuggestionCache(self.path)
+        history = [("crane", "BBGBG")]
+        first = solve(WORDS, history, cache=cache)
+        calls = []
+        cache_only = SuggestionCache(self.path)
+        key = cache_only.key(WORDS, [i for i, w in enumerate(WORDS) if w in first[0]])
+        self.assertEqual(cache_only.get_or_compute(key, lambda: calls.append(1)), first[1])
+        self.assertEqual(calls, [])
+        self.assertEqual(solve(WORDS, history, cache=cache), first)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.stats()["total_hits"], 2)
+        self.assertNotEqual(cache.key(WORDS, [0, 1]), cache.key(WORDS, [0, 1], ("lookahead", 10)))
+        self.assertEqual(cache.key(WORDS, [1, 0]), cache.key(WORDS, [0, 1]))
+        self.assertNotEqual(cache.key(WORDS, [0, 1]), cache.key(WORDS[::-1], [0, 1]))
+
+    def test_lru_eviction_by_size(self):
+        # Each entry is ~60 bytes, so two fit
+        cache = SuggestionCache(self.path, max_bytes=150)
+        keys = [cache.key(WORDS, [i]) for i in range(3)]
+        cache.put(keys[0], [("crane", 1.0, 2.0, 0.5)])
+        cache.put(keys[1], [("slate", 1.0, 2.0, 0.5)])
+        cache.get(keys[0])
+        cache.put(keys[2], [("clash", 1.0, 2.0, 0.5)])
+        stats = cache.stats()
+        self.assertLessEqual(stats["bytes"], 150)
+        self.assertEqual((stats["entries"], stats["evictions"]), (2, 1))
+        # keys[0] was read after keys[1] was written, so keys[1] is the one evicted
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+
+    def test_answer_pool_key_tracks_hard_mode(self):
+        # Both states leave the same answers, but "fills" also rules out f, i, l and s as guesses
+        words, answers = load_wordle_list(), load_answer_list()
+        cache = SuggestionCache(self.path)
+        one = [("crane", "YGGBB")]
+        two = one + [("fills", "BBBBB")]
+        self.assertEqual(solve(words, one, answers=answers)[0], solve(words, two, answers=answers)[0])
+        solve(words, one, cache=cache, answers=answers)
+        _, suggestions, _ = solve(words, two, cache=cache, answers=answers)
+        self.assertEqual(suggestions, solve(words, two, answers=answers)[1])
+        self.assertFalse(any(letter in word for word, *_ in suggestions for letter in "fils"))
+
+    def test_concurrent_processes(self):
+        SuggestionCache(self.path).close()
+        with ProcessPoolExecutor(max_workers=3) as pool:
+            self.assertEqual(sorted(pool.map(_fill, [(self.path, w) for w in range(3)])), [0, 1, 2])
+        stats = SuggestionCache(self.path).stats()
+        self.assertEqual((stats["entries"], stats["total_misses"]), (60, 60))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+# tests/test_word_index.py
+import re
+import unittest
+from feedback import enforce_hard_mode
+from game_state import GameState
+from word_index import WordTrie, get_word_trie
+from wordlist import load_wordle_list
+
+WORDS = ["crane", "slate", "clash", "crony", "trace", "apple", "angle", "alien", "crank", "qxzqx"]
+
+class TestWordTrie(unittest.TestCase):
+    def test_match_equals_regex(self):
+        for words, patterns in ((WORDS, ["cr?n?", "a", "?????", "c?a??", "zz", "crane", ""]),
+                                (load_wordle_list(), ["cr?n?", "?ight", "s", "q?x"])):
+            trie = WordTrie(words) if words is WORDS else get_word_trie()
+            for pattern in patterns:
+                regex = re.compile(pattern.replace("?", ".") + "." * (5 - len(pattern)))
+                expected = sorted(w for w in words if regex.fullmatch(w))
+                self.assertEqual([trie.words[i] for i in trie.match(pattern)], expected, pattern)
+
+    def test_membership(self):
+        trie = WordTrie(WORDS)
+        self.assertIn("crank", trie)
+        self.assertNotIn("cran", trie)
+        self.assertNotIn("cr?nk", trie)
+        self.assertNotIn("crane!", trie)
+
+    def test_game_state_sets_and_consistency(self):
+        state = GameState(WORDS)
+        state.apply("slate", "BBYBB")
+        self.assertEqual(state.candidate_set, set(state.candidates))
+        for word, ok in zip(WORDS, state.consistent):
+            self.assertEqual(ok, enforce_hard_mode(word, state.greens, state.yellows, state.grays))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+# tests/test_wordlist.py
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import wordlist
+from wordlist import (
+    MIN_FREQUENCY, FrequencyIndex, app_data_dir, load_answer_list, load_guess_list, get_frequency_index, get_frequencies, get_frequency, load_frequency_table, load_word_array, load_wordle_list,
+)
+
+class TestWordlist(unittest.TestCase):
+    def test_frequencies_aligned_to_word_list(self):
+        words = load_wordle_list()
+        freqs = get_frequencies()
+        self.assertEqual(len(freqs), len(words))
+        i = words.index("about")
+        self.assertEqual(get_frequency("about"), float(freqs[i]))
+        self.assertGreater(get_frequency("about"), get_frequency("wizzo"))
+
+    def test_frequency_index_top_k(self):
+        index = get_frequency_index()
+        words = load_wordle_list()
+        for exclude in ("", "crane", "aeiou", "etaoinsr"):
+            expected = sorted(
+                [(w, get_frequency(w)) for w in words if all(l not in w for l in exclude)],
+                key=lambda x: x[1], reverse=True,
+            )[:5]
+            self.assertEqual(index.top_k(5, exclude), expected)
+        # Ties keep word-list order; too few matches return what there is
+        small = FrequencyIndex(["abbey", "bravo", "cable", "dozen"], [0.5, 0.5, 0.9, 0.1])
+        self.assertEqual([w for w, _ in small.top_k(3, "c")], ["abbey", "bravo", "dozen"])
+        self.assertEqual(small.top_k(5, "ab"), [("dozen", 0.1)])
+        for k, exclude in ((0, ""), (-2, ""), (5, "e-"), (5, "E")):
+            with self.assertRaises(ValueError):
+                small.top_k(k, exclude)
+
+    def test_frequency_table_rebuilt_when_stale(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "freq.bin")
+            first = load_frequency_table(["about", "qxzqx"], path)
+            self.assertAlmostEqual(float(first[1]), MIN_FREQUENCY)
+            second = load_frequency_table(["qxzqx", "about", "their"], path)
+            self.assertEqual(len(second), 3)
+            self.assertAlmostEqual(float(second[0]), MIN_FREQUENCY)
+
+    def test_packed_word_list_tracks_text_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.txt")
+            with open(path, 'w') as f:
+                f.write("Crane\nslate\ntoo\n")
+            self.assertEqual(load_wordle_list(path), ["crane", "slate"])
+            self.assertTrue(os.path.exists(os.path.join(tmp, "words.bin")))
+            self.assertEqual(load_word_array(path).shape, (2, 5))
+
+            # Editing the text file invalidates the packed copy
+            with open(path, 'w') as f:
+                f.write("apple\nangle\nalien\n")
+            wordlist._word_arrays.pop(path)
+            wordlist._word_lists.pop(path)
+            self.assertEqual(load_wordle_list(path), ["apple", "angle", "alien"])
+
+    def test_answer_and_guess_pools(self):
+        guesses = load_guess_list()
+        self.assertEqual(guesses, load_wordle_list())
+        derived = load_answer_list()
+        self.assertEqual(len(derived), 3000)
+        self.assertEqual(derived, sorted(derived, key=guesses.index))
+        # Unknown words (stored at the floor) rank below every known one
+        floor = min(get_frequency(w) for w in derived)
+        self.assertLess(floor, MIN_FREQUENCY)
+        known = [w for w in guesses if get_frequency(w) != float(np.float32(MIN_FREQUENCY))]
+        self.assertLess(sum(get_frequency(w) > floor for w in known), 3000)
+        for word in ("about", "crane", "slate", "vivid", "pious", "shard", "epoxy"):
+            self.assertIn(word, derived)
+        self.assertNotIn("wizzo", derived)
+        self.assertEqual(len(load_answer_list(size=10)), 10)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "answers.txt")
+            with open(path, 'w') as f:
+                f.write("Crane\nqxzqx\nabout\n")
+            self.assertEqual(load_answer_list(path), ["about", "crane"])
+            # An explicit path is never resolved elsewhere or replaced by the derived pool
+            with self.assertRaises(FileNotFoundError):
+                load_answer_list(os.path.join(tmp, "missing.txt"))
+
+    def test_app_data_dir_survives_frozen_launches(self):
+        self.assertEqual(app_data_dir(), os.path.dirname(os.path.abspath(wordlist.__file__)))
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(sys, 'frozen', True, create=True), \
+                mock.patch.dict(os.environ, {'LOCALAPPDATA': tmp}):
+            path = app_data_dir()
+            self.assertEqual(path, os.path.join(tmp, "WordleSolver"))
+            self.assertTrue(os.path.isdir(path))
+
+if __name__ == "__main__":
+    unittest.main()
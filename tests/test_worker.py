@@ -0,0 +1,55 @@
+# tests/test_worker.py
+import threading
+import time
+import unittest
+from solver import iter_rank_suggestions, rank_suggestions
+from worker import RankingJob
+
+WORDS = ["crane", "slate", "clash", "crony", "trace", "apple", "angle", "alien"]
+
+def _wait_for_result(job, timeout=5):
+    deadline = time.time() + timeout
+    messages = []
+    while time.time() < deadline:
+        messages.extend(job.poll())
+        if messages and messages[-1][0] in ("done", "error"):
+            break
+        time.sleep(0.01)
+    return messages
+
+class TestRankingJob(unittest.TestCase):
+    def test_progressive_snapshots_end_with_full_ranking(self):
+        job = RankingJob(lambda: iter_rank_suggestions(WORDS, {}, {}, set(), chunk_size=1)).start()
+        messages = _wait_for_result(job)
+        kinds = [kind for kind, _ in messages]
+        self.assertEqual(kinds[-1], "done")
+        self.assertTrue(all(kind == "partial" for kind in kinds[:-1]))
+        snapshot = messages[-1][1]
+        self.assertTrue(snapshot.complete)
+        self.assertEqual(snapshot.total, len(WORDS))
+        self.assertEqual(snapshot.top5, rank_suggestions(WORDS, {}, {}, set()))
+
+    def test_cancel_stops_between_snapshots(self):
+        release = threading.Event()
+
+        def snapshots():
+            yield "first"
+            release.wait()
+            yield "second"
+
+        job = RankingJob(snapshots).start()
+        job.cancel()
+        release.set()
+        job._thread.join(timeout=5)
+        self.assertEqual(job.poll(), [])
+
+    def test_errors_are_reported(self):
+        def snapshots():
+            raise RuntimeError("boom")
+            yield
+
+        messages = _wait_for_result(RankingJob(snapshots).start())
+        self.assertEqual(messages[-1][0], "error")
+
+if __name__ == "__main__":
+    unittest.main()
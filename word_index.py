@@ -0,0 +1,82 @@
+# word_index.py
+import numpy as np
+from wordlist import load_word_array, load_wordle_list, words_to_array
+
+WILDCARD = "?"
+
+_default_trie = None
+
+
+class WordTrie:
+    """Array-backed trie over 5-letter words.
+
+    Words are sorted lexicographically, so every prefix covers a contiguous range of
+    that order; node i stores the range [start[i], end[i]) and children[i, letter]
+    (0 = no child; the root is node 0 and never a child). Lookups walk at most five
+    rows and return indices into words.
+    """
+
+    def __init__(self, words, letters=None):
+        self.words = words
+        if letters is None:
+            letters = words_to_array(words)
+        letters = np.asarray(letters, dtype=np.intp) - 97
+        n = len(words)
+        self.order = np.lexsort(letters[:, ::-1].T)
+        ordered = letters[self.order]
+
+        starts, ends, parents, labels = [np.array([0])], [np.array([n])], [np.array([-1])], [np.array([-1])]
+        prev_starts, prev_base, count = starts[0], 0, 1
+        for depth in range(5):
+            new = np.ones(n, dtype=bool)
+            new[1:] = (ordered[1:, :depth + 1] != ordered[:-1, :depth + 1]).any(axis=1)
+            level = np.flatnonzero(new)
+            starts.append(level)
+            ends.append(np.append(level[1:], n))
+            parents.append(prev_base + np.searchsorted(prev_starts, level, side='right') - 1)
+            labels.append(ordered[level, depth])
+            prev_starts, prev_base = level, count
+            count += len(level)
+        self.start = np.concatenate(starts).astype(np.int32)
+        self.end = np.concatenate(ends).astype(np.int32)
+        parents, labels = np.concatenate(parents), np.concatenate(labels)
+        self.children = np.zeros((count, 26), dtype=np.int32)
+        self.children[parents[1:], labels[1:]] = np.arange(1, count, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.words)
+
+    def _nodes(self, pattern):
+        """Nodes reached by pattern, with WILDCARD matching any letter."""
+        nodes = np.zeros(1, dtype=np.int32)
+        for ch in pattern:
+            if ch == WILDCARD:
+                kids = self.children[nodes].ravel()
+            elif 'a' <= ch <= 'z':
+                kids = self.children[nodes, ord(ch) - 97]
+            else:
+                return nodes[:0]
+            nodes = kids[kids > 0]
+            if not len(nodes):
+                break
+        return nodes
+
+    def __contains__(self, word):
+        return len(word) == 5 and WILDCARD not in word and len(self._nodes(word)) == 1
+
+    def match(self, pattern):
+        """Indices into words matching pattern (e.g. "cr?n?"), in alphabetical order.
+
+        Patterns shorter than five letters match as prefixes.
+        """
+        nodes = self._nodes(pattern.lower())
+        if not len(nodes):
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate([self.order[s:e] for s, e in zip(self.start[nodes], self.end[nodes])])
+
+
+def get_word_trie():
+    global _default_trie
+    if _default_trie is None:
+        _default_trie = WordTrie(load_wordle_list(), load_word_array())
+    return _default_trie
@@ -1,14 +1,244 @@
 # wordlist.py
+import hashlib
 import os
-from wordfreq import word_frequency
+import struct
+import sys
+import numpy as np
+from metrics import metrics, timed
 
-def load_wordle_list(filename="wordle_list.txt"):
-    path = os.path.join(os.path.dirname(__file__), filename)
+WORDS_MAGIC = b"WLST"
+WORDS_VERSION = 1
+# magic, format version, word count, text file size and mtime (ns), sha256 of the letters
+_WORDS_HEADER = struct.Struct("<4sIIQQ32s")
+WORDS_HEADER_SIZE = 64
+
+FREQUENCY_FILENAME = "wordle_freq.bin"
+FREQUENCY_MAGIC = b"WFRQ"
+FREQUENCY_VERSION = 1
+# magic, format version, word count, sha256 of the word list; padded to 64 bytes
+_FREQ_HEADER = struct.Struct("<4sII32s")
+FREQ_HEADER_SIZE = 64
+MIN_FREQUENCY = 0.00001
+# Optional curated list of possible answers; without it the most frequent words are used
+ANSWERS_FILENAME = "wordle_answers.txt"
+ANSWER_POOL_SIZE = 3000
+
+_default_frequencies = None
+_default_index = None
+_default_frequency_index = None
+_word_arrays = {}
+_word_lists = {}
+
+def _data_path(filename):
+    return os.path.join(os.path.dirname(__file__), filename)
+
+def app_data_dir():
+    """Directory for files built or written at run time.
+
+    Next to the sources normally; a frozen one-file build unpacks to a fresh temp
+    directory on every launch, so it uses a per-user directory that survives.
+    """
+    if not getattr(sys, 'frozen', False):
+        return os.path.dirname(os.path.abspath(__file__))
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    path = os.path.join(base, 'WordleSolver')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def words_to_array(words):
+    """Pack 5-letter ASCII words into an N x 5 uint8 letter array."""
+    return np.frombuffer(''.join(words).encode('ascii'), dtype=np.uint8).reshape(-1, 5)
+
+def words_from_array(letters):
+    """Display strings for an N x 5 letter array."""
+    # One decode and split is several times faster than slicing per word
+    lines = np.empty((len(letters), 6), dtype=np.uint8)
+    lines[:, :5] = letters
+    lines[:, 5] = ord('\n')
+    return lines.tobytes().decode('ascii').split()
+
+def _parse_word_file(path):
+    with open(path, 'r') as f:
+        return [line.strip().lower() for line in f if len(line.strip()) == 5]
+
+def _binary_path(path):
+    return os.path.splitext(path)[0] + ".bin"
+
+@timed("load_word_array")
+def load_word_array(filename="wordle_list.txt"):
+    """The word list as a memory-mapped N x 5 uint8 array.
+
+    The text file stays the source of truth: the packed copy next to it is rebuilt
+    whenever the text file's size or mtime no longer match its header.
+    """
+    if filename in _word_arrays:
+        return _word_arrays[filename]
+    path = _data_path(filename)
+    bin_path = _binary_path(path)
+    try:
+        st = os.stat(path)
+        with open(bin_path, 'rb') as f:
+            raw = f.read(WORDS_HEADER_SIZE)
+        magic, version, count, size, mtime, checksum = _WORDS_HEADER.unpack_from(raw)
+        if (magic, version, size, mtime) == (WORDS_MAGIC, WORDS_VERSION, st.st_size, st.st_mtime_ns):
+            letters = np.memmap(bin_path, dtype=np.uint8, mode='r', offset=WORDS_HEADER_SIZE, shape=(count, 5))
+            if hashlib.sha256(letters).digest() == checksum:
+                _word_arrays[filename] = letters
+                return letters
+    except (OSError, struct.error, ValueError):
+        pass
+    metrics.incr("word_array_rebuilds")
     try:
-        with open(path, 'r') as f:
-            return [line.strip().lower() for line in f if len(line.strip()) == 5]
+        st = os.stat(path)
+        letters = words_to_array(_parse_word_file(path))
     except Exception as e:
         raise RuntimeError(f"Failed to load word list: {e}")
+    header = _WORDS_HEADER.pack(
+        WORDS_MAGIC, WORDS_VERSION, len(letters), st.st_size, st.st_mtime_ns, hashlib.sha256(letters).digest()
+    )
+    try:
+        tmp_path = f"{bin_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(header.ljust(WORDS_HEADER_SIZE, b'\0'))
+            f.write(letters.tobytes())
+        os.replace(tmp_path, bin_path)
+    except OSError:
+        # Read-only install: keep working from the parsed text
+        pass
+    _word_arrays[filename] = letters
+    return letters
+
+def load_wordle_list(filename="wordle_list.txt"):
+    """Word strings for display and lookups, decoded once per process from the packed array.
+
+    Every call returns the same list, so identity checks against it are cheap; callers
+    must not modify it.
+    """
+    if filename not in _word_lists:
+        _word_lists[filename] = words_from_array(load_word_array(filename))
+    return _word_lists[filename]
+
+def load_guess_list(filename="wordle_list.txt"):
+    """Every word accepted as a guess."""
+    return load_wordle_list(filename)
+
+def load_answer_list(path=None, size=ANSWER_POOL_SIZE):
+    """Words that can be the solution, in guess-list order.
+
+    Read from path as given, which must exist, or by default from ANSWERS_FILENAME
+    next to the word list when present; words missing from the guess list are
+    dropped. Without either, the size most frequent guess-list words, about the size
+    of the official answer list. Words wordfreq does not know are stored at
+    MIN_FREQUENCY, above many real but rare words, so every word at exactly that
+    floor ranks last.
+    """
+    guesses = load_guess_list()
+    if path is None and os.path.exists(_data_path(ANSWERS_FILENAME)):
+        path = _data_path(ANSWERS_FILENAME)
+    if path is not None:
+        answers = set(_parse_word_file(path))
+        return [w for w in guesses if w in answers]
+    order = get_frequency_index().order
+    unknown = get_frequencies()[order] == np.float32(MIN_FREQUENCY)
+    ranked = np.concatenate([order[~unknown], order[unknown]])
+    return [guesses[i] for i in np.sort(ranked[:size])]
+
+def word_list_hash(words):
+    return hashlib.sha256('\n'.join(words).encode('ascii')).digest()
+
+def _lookup_frequency(word):
+    # wordfreq is slow to import and only needed when the table is regenerated
+    from wordfreq import word_frequency
+    return word_frequency(word, 'en') or MIN_FREQUENCY
+
+@timed("build_frequency_table")
+def build_frequency_table(words, path):
+    freqs = np.array([_lookup_frequency(w) for w in words], dtype=np.float32)
+    header = _FREQ_HEADER.pack(FREQUENCY_MAGIC, FREQUENCY_VERSION, len(words), word_list_hash(words))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header.ljust(FREQ_HEADER_SIZE, b'\0'))
+        f.write(freqs.tobytes())
+    os.replace(tmp_path, path)
+    return freqs
+
+@timed("load_frequency_table")
+def load_frequency_table(words, path):
+    """float32 frequencies aligned to words, rebuilt if the file is missing or stale."""
+    expected = (FREQUENCY_MAGIC, FREQUENCY_VERSION, len(words), word_list_hash(words))
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except OSError:
+        raw = b''
+    if len(raw) == FREQ_HEADER_SIZE + 4 * len(words) and _FREQ_HEADER.unpack_from(raw) == expected:
+        return np.frombuffer(raw, dtype=np.float32, offset=FREQ_HEADER_SIZE)
+    return build_frequency_table(words, path)
+
+def get_frequencies():
+    """Frequency table for the default word list, in load_wordle_list() order."""
+    global _default_frequencies
+    if _default_frequencies is None:
+        _default_frequencies = load_frequency_table(load_wordle_list(), _data_path(FREQUENCY_FILENAME))
+    return _default_frequencies
+
+def get_word_index():
+    """Map of word -> position in the default word list."""
+    global _default_index
+    if _default_index is None:
+        _default_index = {w: i for i, w in enumerate(load_wordle_list())}
+    return _default_index
+
+def letter_mask(letters):
+    """26-bit mask with one bit per letter a-z; anything else raises ValueError."""
+    mask = 0
+    for letter in letters:
+        if not "a" <= letter <= "z":
+            raise ValueError(f"not a letter a-z: {letter!r}")
+        mask |= 1 << (ord(letter) - 97)
+    return mask
+
+class FrequencyIndex:
+    """Words presorted by descending frequency, with a 26-bit letter-presence mask each.
+
+    Most-frequent-first queries become a scan that stops as soon as k words pass,
+    instead of a filter and a full sort. Ties keep word-list order.
+    """
+
+    SCAN = 1024
+
+    def __init__(self, words, frequencies, letters=None):
+        self.words = words
+        self.frequencies = frequencies
+        if letters is None:
+            letters = words_to_array(words)
+        bits = np.left_shift(np.uint32(1), letters.astype(np.uint32) - 97)
+        self.masks = np.bitwise_or.reduce(bits, axis=1)
+        self.order = np.argsort(-np.asarray(frequencies), kind='stable')
+        # Masks in frequency order, so the scan reads them contiguously
+        self._ordered_masks = self.masks[self.order]
+
+    def top_k(self, k=5, exclude=""):
+        """(word, frequency) for the k most frequent words containing none of exclude."""
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        excluded = np.uint32(letter_mask(exclude))
+        found = []
+        for start in range(0, len(self.order), self.SCAN):
+            hits = np.flatnonzero((self._ordered_masks[start:start + self.SCAN] & excluded) == 0)
+            found.extend(self.order[start + hits[:k - len(found)]])
+            if len(found) >= k:
+                break
+        return [(self.words[i], float(self.frequencies[i])) for i in found]
+
+def get_frequency_index():
+    global _default_frequency_index
+    if _default_frequency_index is None:
+        _default_frequency_index = FrequencyIndex(load_wordle_list(), get_frequencies(), load_word_array())
+    return _default_frequency_index
 
 def get_frequency(word):
-    return word_frequency(word, 'en') or 0.00001
\ No newline at end of file
+    i = get_word_index().get(word)
+    if i is None:
+        return _lookup_frequency(word)
+    return float(get_frequencies()[i])
@@ -0,0 +1,52 @@
+# worker.py
+import queue
+import threading
+
+
+class RankingJob:
+    """Runs a snapshot generator on a background thread and hands results to a poller.
+
+    The GUI polls with root.after, so Tk is only ever touched from the main thread.
+    Messages are ("partial", snapshot), ("done", snapshot) or ("error", exception).
+    """
+
+    def __init__(self, snapshots):
+        self._snapshots = snapshots
+        self._results = queue.Queue()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def _run(self):
+        last = None
+        try:
+            for snapshot in self._snapshots():
+                # Checked between chunks, so cancellation lands within one chunk of work
+                if self._cancelled.is_set():
+                    return
+                if last is not None:
+                    self._results.put(("partial", last))
+                last = snapshot
+            if not self._cancelled.is_set():
+                self._results.put(("done", last))
+        except Exception as e:
+            self._results.put(("error", e))
+
+    def poll(self):
+        """Drain every message produced since the last poll."""
+        messages = []
+        while True:
+            try:
+                messages.append(self._results.get_nowait())
+            except queue.Empty:
+                return messages